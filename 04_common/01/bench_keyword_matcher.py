@@ -0,0 +1,72 @@
+import argparse
+import random
+import string
+import time
+
+from keyword_matcher import KeywordMatcher
+from main import DANGER_KEYWORDS, LOG_FILE, iter_records
+
+KEYWORD_COUNTS = (5, 100, 1000)
+
+
+# 기존 방식: 키워드마다 `keyword in message` 를 검사
+def nested_loop_filter(messages, keywords):
+    matched = []
+    for message in messages:
+        for keyword in keywords:
+            if keyword in message:
+                matched.append(message)
+                break
+    return matched
+
+
+def matcher_filter(messages, matcher):
+    return [message for message, _ in matcher.match_items(messages)]
+
+
+# 실제 로그 메시지를 반복해 lines 개의 메시지를 만듦
+def load_messages(lines):
+    base = [message for _, _, message in iter_records(LOG_FILE)]
+    return [base[i % len(base)] for i in range(lines)]
+
+
+# DANGER_KEYWORDS 에 로그에 등장하지 않는 임의 키워드를 더해 count 개로 맞춤
+def make_keywords(count, rng):
+    keywords = list(DANGER_KEYWORDS)[:count]
+    while len(keywords) < count:
+        length = rng.randint(5, 12)
+        keywords.append(''.join(rng.choices(string.ascii_lowercase, k=length)))
+    return keywords
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='위험 키워드 매칭 벤치마크')
+    parser.add_argument('--lines', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    messages = load_messages(args.lines)
+    print(f'메시지 {len(messages)}줄')
+    print(f'{"keywords":>8} | {"nested loop(s)":>14} | {"build(s)":>8} | '
+          f'{"matcher(s)":>12} | {"speedup":>7}')
+
+    for count in KEYWORD_COUNTS:
+        keywords = make_keywords(count, rng)
+        expected, loop_time = timed(nested_loop_filter, messages, keywords)
+        matcher, build_time = timed(KeywordMatcher, keywords)
+        result, match_time = timed(matcher_filter, messages, matcher)
+        if result != expected:
+            raise RuntimeError(f'결과 불일치 (keywords={count})')
+        print(f'{count:>8} | {loop_time:>14.4f} | {build_time:>8.4f} | '
+              f'{match_time:>12.4f} | {loop_time / match_time:>6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import main
+from gen_mission_log import generate_log
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+BENCH_DIR = os.path.join(main.BASE_DIR, 'bench_results')
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+# 현재 프로세스의 최대 RSS (MB), 측정할 수 없으면 None
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 는 byte, Linux 는 KB 단위
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+# 앞 단계에서 받은 iterable 을 감싸 앞 단계(파싱, run 병합 등)가 값을 만드는 데 쓴 시간을 따로 셈
+# 단계 시간에서 이 시간을 빼면 그 단계 자체의 시간만 남음
+class TimedIter:
+    def __init__(self, iterable):
+        self._it = iter(iterable)
+        self.seconds = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return next(self._it)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+
+# 결과를 저장하지 않고 끝까지 소비하며 개수만 셈
+def drain(iterable):
+    count = 0
+    for _ in iterable:
+        count += 1
+    return count
+
+
+def sorted_records(log_file, sort_buffer, stack):
+    sorted_list = main.sort_list(main.file_to_list(log_file), sort_buffer)
+    if sort_buffer is not None:
+        stack.enter_context(sorted_list)
+    return sorted_list
+
+
+# 단계마다 (입력 준비, 측정) 함수
+# 입력 준비는 시간/RSS 측정에서 빠지고, 측정 함수는 (처리한 항목 수, 앞 단계 TimedIter) 를 반환
+def setup_none(log_file, sort_buffer, stack):
+    return None
+
+
+def run_read_file(data, log_file, sort_buffer, output):
+    main.read_file(log_file, sort_buffer)
+    return None, None
+
+
+def run_file_to_list(data, log_file, sort_buffer, output):
+    return drain(main.file_to_list(log_file)), None
+
+
+def run_sort_list(data, log_file, sort_buffer, output):
+    parsed = TimedIter(main.file_to_list(log_file))
+    with contextlib.ExitStack() as stack:
+        sorted_list = main.sort_list(parsed, sort_buffer)
+        if sort_buffer is not None:
+            stack.enter_context(sorted_list)
+        return drain(sorted_list), parsed
+
+
+def run_danger_keyword_filtering(sorted_list, log_file, sort_buffer, output):
+    upstream = TimedIter(sorted_list)
+    return drain(main.danger_keyword_filtering(upstream)), upstream
+
+
+def run_list_to_dict(sorted_list, log_file, sort_buffer, output):
+    upstream = TimedIter(sorted_list)
+    return len(main.list_to_dict(upstream)), upstream
+
+
+def setup_dict(log_file, sort_buffer, stack):
+    return main.list_to_dict(sorted_records(log_file, sort_buffer, stack))
+
+
+def run_save_dict_to_json(dict_data, log_file, sort_buffer, output):
+    main.save_dict_to_json(dict_data, output)
+    return len(dict_data), None
+
+
+# sort_buffer 를 쓰는 스트리밍 파이프라인은 dict 를 만들지 않고 같은 JSON 을 바로 기록
+def run_write_json_object(sorted_list, log_file, sort_buffer, output):
+    upstream = TimedIter(sorted_list)
+    return main.write_json_object(upstream, output, main.to_epoch_us), upstream
+
+
+STAGES = {
+    'read_file': (setup_none, run_read_file),
+    'file_to_list': (setup_none, run_file_to_list),
+    'sort_list': (setup_none, run_sort_list),
+    'danger_keyword_filtering': (sorted_records, run_danger_keyword_filtering),
+    'list_to_dict': (sorted_records, run_list_to_dict),
+    'save_dict_to_json': (setup_dict, run_save_dict_to_json),
+    'write_json_object': (sorted_records, run_write_json_object),
+}
+# 메모리 정렬은 main.py 와 같이 dict 를 만들고, 외부 정렬은 전체를 메모리에 올리는 단계 없이 측정
+IN_MEMORY_STAGES = ('read_file', 'file_to_list', 'sort_list', 'danger_keyword_filtering',
+                    'list_to_dict', 'save_dict_to_json')
+STREAMING_STAGES = ('read_file', 'file_to_list', 'sort_list', 'danger_keyword_filtering',
+                    'write_json_object')
+
+
+# 단계 하나를 새 프로세스에서 실행해 소요 시간/처리량/최대 RSS 를 기록 (콘솔 출력은 버림)
+# rss_delta_mb 는 입력을 준비한 뒤부터 단계가 끝날 때까지 늘어난 최대 RSS
+def measure_stage(name, log_file, lines, sort_buffer):
+    setup, run = STAGES[name]
+    with tempfile.TemporaryDirectory(prefix='mission_bench_') as tmp, \
+            open(os.devnull, 'w', encoding='utf-8') as devnull, \
+            contextlib.redirect_stdout(devnull), \
+            contextlib.ExitStack() as stack:
+        data = setup(log_file, sort_buffer, stack)
+        before = peak_rss_mb()
+        start = time.perf_counter()
+        count, upstream = run(data, log_file, sort_buffer, os.path.join(tmp, 'bench.json'))
+        seconds = time.perf_counter() - start
+        if upstream is not None:
+            seconds -= upstream.seconds
+        after = peak_rss_mb()
+    return {
+        'seconds': round(seconds, 4),
+        'lines_per_sec': round(lines / seconds) if seconds > 0 else None,
+        'items': count,
+        'peak_rss_mb': after,
+        'rss_delta_mb': None if after is None else round(after - before, 1),
+    }
+
+
+# 로그 하나에 대해 main.py 파이프라인 단계를 하나씩 별도 프로세스에서 측정
+# 단계 사이에 결과를 메모리에 들고 있지 않으므로 sort_buffer 를 지정하면 1억 줄 로그도 측정 가능
+def bench_log(log_file, lines, sort_buffer=None):
+    names = IN_MEMORY_STAGES if sort_buffer is None else STREAMING_STAGES
+    stages = {name: run_isolated(measure_stage, name, log_file, lines, sort_buffer)
+              for name in names}
+
+    total = sum(stage['seconds'] for stage in stages.values())
+    rss = [stage['peak_rss_mb'] for stage in stages.values() if stage['peak_rss_mb'] is not None]
+    return {
+        'log_file': log_file,
+        'lines': lines,
+        'file_bytes': os.path.getsize(log_file),
+        'danger_lines': stages['danger_keyword_filtering']['items'],
+        'sort_buffer': sort_buffer,
+        'stages': stages,
+        'total_seconds': round(total, 4),
+        'lines_per_sec': round(lines / total) if total > 0 else None,
+        'peak_rss_mb': max(rss) if rss else None,
+    }
+
+
+# 크기 하나에 대해 로그를 생성하고 측정
+def bench_size(lines, danger_density, disorder, seed, sort_buffer, log_dir):
+    log_file = os.path.join(log_dir, f'mission_{lines}.log')
+    generate_log(log_file, lines, danger_density, disorder, seed)
+    try:
+        return bench_log(log_file, lines, sort_buffer)
+    finally:
+        os.remove(log_file)
+
+
+def run_isolated(fn, *args):
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(fn, *args).result()
+
+
+def print_summary(run):
+    print(f"\n[{run['lines']:,}줄, {run['file_bytes'] / 1024 / 1024:.1f}MB] "
+          f"총 {run['total_seconds']:.3f}s, {run['lines_per_sec']:,} lines/s, "
+          f"peak RSS {run['peak_rss_mb']}MB")
+    for name, stage in run['stages'].items():
+        print(f"  {name:<26} {stage['seconds']:>9.3f}s  "
+              f"{stage['lines_per_sec'] or 0:>12,} lines/s  "
+              f"rss {stage['peak_rss_mb']}MB (+{stage['rss_delta_mb']}MB)")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description='mission log 파이프라인 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='생성할 로그 줄 수 (10K ~ 100M)')
+    parser.add_argument('--log', default=None,
+                        help='합성 로그 대신 측정할 기존 로그 파일')
+    parser.add_argument('--danger-density', type=float, default=0.01)
+    parser.add_argument('--disorder', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sort-buffer', type=int, default=main.DEFAULT_BUFFER_RECORDS,
+                        help=f'외부 정렬 버퍼 레코드 수 (기본값 {main.DEFAULT_BUFFER_RECORDS}, '
+                             f'0 이면 main.py 기본 동작처럼 메모리 정렬 후 dict 생성)')
+    parser.add_argument('--log-dir', default=None,
+                        help='합성 로그를 만들 디렉터리 (기본값은 임시 디렉터리)')
+    parser.add_argument('--output', default=None,
+                        help='결과 JSON 경로 (기본값은 bench_results/pipeline-<시각>.json)')
+    args = parser.parse_args()
+    if args.sort_buffer == 0:
+        args.sort_buffer = None
+
+    runs = []
+    if args.log is not None:
+        with open(args.log, 'rb') as f:
+            lines = sum(1 for _ in f)
+        runs.append(bench_log(args.log, lines, args.sort_buffer))
+        print_summary(runs[-1])
+    else:
+        with tempfile.TemporaryDirectory(prefix='mission_logs_', dir=args.log_dir) as log_dir:
+            for lines in args.sizes:
+                runs.append(bench_size(lines, args.danger_density, args.disorder,
+                                       args.seed, args.sort_buffer, log_dir))
+                print_summary(runs[-1])
+
+    result = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'options': {
+            'danger_density': args.danger_density,
+            'disorder': args.disorder,
+            'seed': args.seed,
+            'sort_buffer': args.sort_buffer,
+        },
+        'runs': runs,
+    }
+    output = args.output
+    if output is None:
+        os.makedirs(BENCH_DIR, exist_ok=True)
+        output = os.path.join(BENCH_DIR, f'pipeline-{datetime.now():%Y%m%d-%H%M%S}.json')
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f'\n[INFO] 벤치마크 결과 저장됨: {output}')
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,137 @@
+import json
+import math
+import zlib
+
+from trigram_index import trigrams
+
+MAGIC = b'BLOOMIDX1\n'
+# 블록 하나의 목표 크기 (블록 경계는 항상 줄의 시작 위치)
+DEFAULT_BLOCK_SIZE = 64 * 1024
+DEFAULT_FP_RATE = 0.01
+
+
+# trigram 을 비트 위치로 바꾸는 두 해시 (실행할 때마다 값이 바뀌는 hash() 대신 사용)
+def _hash_pair(token):
+    data = token.encode('utf-8')
+    return zlib.crc32(data), zlib.adler32(data) | 1
+
+
+# 고정 크기 비트 배열 Bloom 필터 (double hashing 으로 num_hashes 개 위치 계산)
+class BloomFilter:
+    def __init__(self, num_bits, num_hashes, bits=None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray((num_bits + 7) // 8) if bits is None else bits
+
+    # 원소 수와 목표 오탐률로 최적 비트 수/해시 수 계산
+    @classmethod
+    def for_capacity(cls, count, fp_rate=DEFAULT_FP_RATE):
+        count = max(count, 1)
+        num_bits = max(8, math.ceil(-count * math.log(fp_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / count * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, token):
+        h1, h2 = _hash_pair(token)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, token):
+        for pos in self._positions(token):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, token):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(token))
+
+
+# 로그 파일을 줄 경계에 맞춘 고정 크기 블록으로 나누고, 블록마다 줄(소문자)의 trigram Bloom 필터를 둔 색인
+# 검색어의 trigram 중 하나라도 필터에 없으면 그 블록에는 검색어가 있을 수 없으므로 읽지 않음
+# (대소문자 구분 여부와 상관없이 후보를 놓치지 않도록 소문자로 색인)
+class BlockBloomIndex:
+    def __init__(self, blocks, filters, fingerprint=None):
+        self.blocks = blocks
+        self.filters = filters
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, file, block_size=DEFAULT_BLOCK_SIZE, fp_rate=DEFAULT_FP_RATE,
+              fingerprint=None):
+        blocks = []
+        filters = []
+
+        # 블록 전체 텍스트의 trigram 을 한 번에 계산 (줄바꿈에 걸친 trigram 은 검색어와 일치할 수 없어 무해)
+        def close_block(start, end, lines):
+            grams = trigrams(b''.join(lines).decode('utf-8').lower())
+            bloom = BloomFilter.for_capacity(len(grams), fp_rate)
+            for gram in grams:
+                bloom.add(gram)
+            blocks.append((start, end))
+            filters.append(bloom)
+
+        with open(file, 'rb') as f:
+            start = pos = 0
+            lines = []
+            for raw in f:
+                lines.append(raw)
+                pos += len(raw)
+                if pos - start >= block_size:
+                    close_block(start, pos, lines)
+                    start = pos
+                    lines = []
+            if pos > start:
+                close_block(start, pos, lines)
+        return cls(blocks, filters, fingerprint)
+
+    # 파일 구성: MAGIC / 헤더 JSON 한 줄 / 블록별 비트 배열 연속
+    # 헤더의 blocks 는 [시작 위치, 끝 위치, 비트 수, 해시 수]
+    def save(self, path):
+        header = {
+            'fingerprint': self.fingerprint,
+            'blocks': [[start, end, bloom.num_bits, bloom.num_hashes]
+                       for (start, end), bloom in zip(self.blocks, self.filters)],
+        }
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(json.dumps(header).encode('utf-8'))
+            f.write(b'\n')
+            for bloom in self.filters:
+                f.write(bloom.bits)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            if f.readline() != MAGIC:
+                raise ValueError(f'Bloom 색인 파일 형식이 아닙니다: {path}')
+            header = json.loads(f.readline().decode('utf-8'))
+            blocks = []
+            filters = []
+            for start, end, num_bits, num_hashes in header['blocks']:
+                bits = bytearray(f.read((num_bits + 7) // 8))
+                if len(bits) != (num_bits + 7) // 8:
+                    raise ValueError(f'Bloom 색인 파일이 잘려 있습니다: {path}')
+                blocks.append((start, end))
+                filters.append(BloomFilter(num_bits, num_hashes, bits))
+        return cls(blocks, filters, header['fingerprint'])
+
+    def __len__(self):
+        return len(self.blocks)
+
+    # 블록에 pattern 이 있을 수 있는지 (3글자보다 짧은 검색어는 항상 True)
+    def may_contain(self, block_no, pattern):
+        bloom = self.filters[block_no]
+        return all(gram in bloom for gram in trigrams(pattern.lower()))
+
+    # patterns 중 하나라도 있을 수 있는 블록의 (시작 위치, 끝 위치)
+    def candidate_blocks(self, patterns):
+        patterns = list(patterns)
+        return [block for block_no, block in enumerate(self.blocks)
+                if any(self.may_contain(block_no, pattern) for pattern in patterns)]
+
+
+# 지정한 블록들만 읽어 줄 단위로 반환 (블록 경계는 줄의 시작 위치이므로 줄이 잘리지 않음)
+def iter_block_lines(file, blocks):
+    with open(file, 'rb') as f:
+        for start, end in blocks:
+            f.seek(start)
+            for raw in f.read(end - start).split(b'\n'):
+                yield raw.decode('utf-8')
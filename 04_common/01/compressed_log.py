@@ -0,0 +1,164 @@
+import bz2
+import gzip
+import io
+import lzma
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+MAGIC_NUMBERS = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+)
+OPENERS = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+# gzip member 헤더: magic(1f 8b) + deflate(08)
+GZIP_MEMBER_HEADER = b'\x1f\x8b\x08'
+READ_CHUNK = 1024 * 1024
+# 작업 프로세스가 member 하나를 해제해 돌려줄 수 있는 최대 크기
+# (이보다 큰 member 는 작업 프로세스가 해제를 멈추고 부모 프로세스가 스트리밍으로 해제하므로
+#  동시에 메모리에 있는 해제 결과는 대기 중인 작업 수 x MEMBER_CAP 이하)
+MEMBER_CAP = 16 * 1024 * 1024
+
+
+# 파일 앞부분의 magic number 로 압축 형식 판별 (압축되지 않았으면 None)
+def detect_compression(file):
+    with open(file, 'rb') as f:
+        head = f.read(6)
+    for magic, name in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+# 압축 여부와 상관없이 UTF-8 텍스트로 한 줄씩 읽을 수 있는 파일 객체 (스트리밍 해제)
+def open_log_text(file):
+    compression = detect_compression(file)
+    if compression is None:
+        return open(file, 'r', encoding='utf-8')
+    return OPENERS[compression](file, 'rt', encoding='utf-8')
+
+
+# gzip member 시작 후보 위치 (압축 데이터 안에 우연히 같은 바이트가 있을 수 있어 후보일 뿐)
+def _member_candidates(file):
+    candidates = []
+    tail = b''
+    base = 0
+    with open(file, 'rb') as f:
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                break
+            data = tail + chunk
+            start = base - len(tail)
+            pos = data.find(GZIP_MEMBER_HEADER)
+            while pos != -1:
+                if not candidates or start + pos > candidates[-1]:
+                    candidates.append(start + pos)
+                pos = data.find(GZIP_MEMBER_HEADER, pos + 1)
+            tail = data[-(len(GZIP_MEMBER_HEADER) - 1):]
+            base += len(chunk)
+    return candidates
+
+
+# offset 에서 시작하는 gzip member 하나를 해제 (ProcessPoolExecutor 작업 단위)
+# -> ('ok', member 끝 위치, 해제한 바이트)
+#    올바른 member 가 아니면 ('invalid', None, None), 해제한 크기가 cap 을 넘으면 ('oversized', None, None)
+def inflate_member(file, offset, cap=MEMBER_CAP):
+    inflater = zlib.decompressobj(wbits=31)
+    output = io.BytesIO()
+    consumed = 0
+    try:
+        with open(file, 'rb') as f:
+            f.seek(offset)
+            while not inflater.eof:
+                chunk = f.read(READ_CHUNK)
+                if not chunk:
+                    return 'invalid', None, None
+                consumed += len(chunk)
+                # 압축률이 높은 데이터도 cap 을 크게 넘지 않도록 해제할 크기를 제한
+                while chunk and not inflater.eof:
+                    output.write(inflater.decompress(chunk, cap + 1 - output.tell()))
+                    if output.tell() > cap:
+                        return 'oversized', None, None
+                    chunk = inflater.unconsumed_tail
+    except zlib.error:
+        return 'invalid', None, None
+    end = offset + consumed - len(inflater.unused_data)
+    return 'ok', end, output.getvalue()
+
+
+# offset 에서 시작하는 gzip member 하나를 READ_CHUNK 이하 조각으로 해제하며 반환 (member 끝 위치를 return)
+# inflate_member 가 cap 을 넘는다고 알린 member 를 부모 프로세스에서 스트리밍으로 해제할 때 사용
+def _stream_member(file, offset):
+    inflater = zlib.decompressobj(wbits=31)
+    consumed = 0
+    with open(file, 'rb') as f:
+        f.seek(offset)
+        while not inflater.eof:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                raise ValueError(f'gzip member 가 중간에 끝났습니다 (offset {offset}): {file}')
+            consumed += len(chunk)
+            while chunk and not inflater.eof:
+                try:
+                    yield inflater.decompress(chunk, READ_CHUNK)
+                except zlib.error as e:
+                    raise ValueError(f'gzip member 해제 실패 (offset {offset}): {file}') from e
+                chunk = inflater.unconsumed_tail
+    return offset + consumed - len(inflater.unused_data)
+
+
+# 여러 member 로 된 gzip 파일을 member 단위로 병렬 해제하면서 순서대로 반환
+# 실제 member 는 앞 member 가 끝난 위치에서 시작하므로, 그 위치의 후보 결과만 사용
+# MEMBER_CAP 보다 큰 member 는 부모 프로세스에서 조각 단위로 스트리밍 해제
+def iter_gzip_members_parallel(file, workers, candidates=None):
+    if candidates is None:
+        candidates = _member_candidates(file)
+    if not candidates or candidates[0] != 0:
+        raise ValueError(f'gzip 파일이 아닙니다: {file}')
+
+    window = max(workers * 2, 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        submitted = 0
+        position = 0
+        for candidate in candidates:
+            while submitted < len(candidates) and len(pending) < window:
+                offset = candidates[submitted]
+                pending[offset] = executor.submit(inflate_member, file, offset, MEMBER_CAP)
+                submitted += 1
+            future = pending.pop(candidate)
+            if candidate < position:
+                future.cancel()
+                continue
+            if candidate > position:
+                break
+            status, end, data = future.result()
+            if status == 'oversized':
+                end = yield from _stream_member(file, candidate)
+            elif status != 'ok':
+                raise ValueError(f'gzip member 해제 실패 (offset {candidate}): {file}')
+            else:
+                yield data
+            position = end
+        for future in pending.values():
+            future.cancel()
+
+
+# 병렬로 해제한 member 들을 이어 붙여 UTF-8 줄 단위로 반환 (member 경계에 걸친 줄도 처리)
+# member 후보가 하나뿐이면 병렬로 나눌 수 없으므로 open_log_text 로 스트리밍
+def iter_gzip_lines_parallel(file, workers):
+    candidates = _member_candidates(file)
+    if len(candidates) <= 1:
+        with open_log_text(file) as f:
+            yield from f
+        return
+    carry = b''
+    for data in iter_gzip_members_parallel(file, workers, candidates):
+        data = carry + data
+        cut = data.rfind(b'\n') + 1
+        carry = data[cut:]
+        if cut:
+            yield from io.TextIOWrapper(io.BytesIO(data[:cut]), encoding='utf-8')
+    if carry:
+        yield carry.decode('utf-8')
@@ -0,0 +1,104 @@
+import heapq
+import json
+import os
+import tempfile
+from operator import itemgetter
+
+# 한 번에 메모리에 올려 정렬할 레코드 수 기본값
+DEFAULT_BUFFER_RECORDS = 100_000
+# 한 번의 병합에서 동시에 여는 run 파일 수 (파일 핸들 수 제한)
+MERGE_FAN_IN = 64
+
+_epoch_key = itemgetter(0)
+
+
+# 정렬된 (epoch, item) 묶음을 run 파일로 기록
+def _write_run(pairs, directory):
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory,
+                                     suffix='.run', delete=False) as f:
+        for epoch, item in pairs:
+            f.write(json.dumps([epoch, list(item)], ensure_ascii=False))
+            f.write('\n')
+    return f.name
+
+
+# run 파일을 한 줄씩 읽어 (epoch, item) 으로 반환
+def _read_run(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            epoch, item = json.loads(line)
+            yield epoch, item
+
+
+def _merge_runs(paths, reverse):
+    return heapq.merge(*(_read_run(path) for path in paths),
+                       key=_epoch_key, reverse=reverse)
+
+
+# 디스크에 쪼개 저장한 정렬 run 들을 k-way heap 병합으로 스트리밍하는 객체
+# 순회할 때마다 run 파일을 다시 병합하므로 여러 단계에서 반복해서 사용할 수 있음
+class ExternalSortedRuns:
+    def __init__(self, tmp_dir, run_paths, reverse):
+        self._tmp_dir = tmp_dir
+        self.run_paths = run_paths
+        self.reverse = reverse
+
+    def __iter__(self):
+        for _, item in self.keyed():
+            yield item
+
+    # 정렬 키와 함께 (epoch, item) 으로 반환 (다른 정렬 결과와 다시 병합할 때 사용)
+    def keyed(self):
+        if self._tmp_dir is None:
+            raise ValueError('이미 정리된 정렬 결과입니다.')
+        return _merge_runs(self.run_paths, self.reverse)
+
+    def close(self):
+        if self._tmp_dir is not None:
+            self._tmp_dir.cleanup()
+            self._tmp_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# (epoch, item) 스트림을 buffer_records 개씩 정렬해 임시 파일로 내보낸 뒤
+# 병합 가능한 ExternalSortedRuns 로 반환 (메모리는 buffer_records 개로 제한)
+def external_sort(keyed_items, buffer_records=DEFAULT_BUFFER_RECORDS,
+                  reverse=True, tmp_dir=None):
+    if buffer_records < 1:
+        raise ValueError('buffer_records 는 1 이상이어야 합니다.')
+
+    work_dir = tempfile.TemporaryDirectory(prefix='mission_sort_', dir=tmp_dir)
+    try:
+        run_paths = []
+        chunk = []
+        for pair in keyed_items:
+            chunk.append(pair)
+            if len(chunk) >= buffer_records:
+                chunk.sort(key=_epoch_key, reverse=reverse)
+                run_paths.append(_write_run(chunk, work_dir.name))
+                chunk = []
+        if chunk or not run_paths:
+            chunk.sort(key=_epoch_key, reverse=reverse)
+            run_paths.append(_write_run(chunk, work_dir.name))
+        del chunk
+
+        # run 이 너무 많으면 fan-in 단위로 미리 병합해 run 수를 줄임
+        while len(run_paths) > MERGE_FAN_IN:
+            merged_paths = []
+            for i in range(0, len(run_paths), MERGE_FAN_IN):
+                group = run_paths[i:i + MERGE_FAN_IN]
+                merged_paths.append(
+                    _write_run(_merge_runs(group, reverse), work_dir.name))
+                for path in group:
+                    os.remove(path)
+            run_paths = merged_paths
+    except BaseException:
+        work_dir.cleanup()
+        raise
+
+    return ExternalSortedRuns(work_dir, run_paths, reverse)
@@ -0,0 +1,74 @@
+import argparse
+import random
+from datetime import datetime, timedelta
+
+from main import DANGER_KEYWORDS
+
+LEVELS = ('INFO', 'WARNING', 'ERROR')
+LEVEL_WEIGHTS = (90, 8, 2)
+
+NORMAL_MESSAGES = (
+    'Power systems online. Batteries at optimal charge.',
+    'Communication established with mission control.',
+    'Avionics check: All systems functional.',
+    'Propulsion check: Thrusters responding as expected.',
+    'Life support systems nominal.',
+    'Cargo bay secured and sealed properly.',
+    'Navigation systems show nominal performance.',
+    'Heat shield performing as expected during reentry.',
+    'Telemetry packet received from subsystem {n}.',
+    'Thermal control loop {n} within limits.',
+)
+DANGER_TEMPLATES = (
+    '{keyword} detected in subsystem {n}.',
+    'Warning: {keyword} reported by sensor {n}.',
+    'Crew alerted: {keyword} near module {n}.',
+)
+
+
+# timestamp,event,message 형식의 합성 로그 줄을 하나씩 생성
+# danger_density 비율만큼 위험 키워드가 들어간 메시지를 섞고,
+# disorder 비율만큼 시간이 앞뒤로 뒤섞인 줄을 만듦
+def iter_synthetic_lines(lines, danger_density=0.01, disorder=0.0, seed=0,
+                         start=datetime(2023, 8, 27, 10, 0, 0)):
+    rng = random.Random(seed)
+    keywords = sorted(DANGER_KEYWORDS)
+    current = start
+    for i in range(lines):
+        current += timedelta(seconds=rng.randint(0, 3))
+        timestamp = current
+        if disorder and rng.random() < disorder:
+            timestamp -= timedelta(seconds=rng.randint(1, 3600))
+        level = rng.choices(LEVELS, LEVEL_WEIGHTS)[0]
+        if rng.random() < danger_density:
+            message = rng.choice(DANGER_TEMPLATES).format(
+                keyword=rng.choice(keywords), n=i % 97)
+        else:
+            message = rng.choice(NORMAL_MESSAGES).format(n=i % 97)
+        yield f'{timestamp:%Y-%m-%d %H:%M:%S},{level},{message}\n'
+
+
+def generate_log(file, lines, danger_density=0.01, disorder=0.0, seed=0):
+    with open(file, 'w', encoding='utf-8') as f:
+        f.write('timestamp,event,message\n')
+        f.writelines(iter_synthetic_lines(lines, danger_density, disorder, seed))
+    return file
+
+
+def main():
+    parser = argparse.ArgumentParser(description='합성 mission computer 로그 생성')
+    parser.add_argument('output', help='생성할 로그 파일 경로')
+    parser.add_argument('--lines', type=int, default=10_000)
+    parser.add_argument('--danger-density', type=float, default=0.01,
+                        help='위험 키워드가 들어간 줄의 비율 (0~1)')
+    parser.add_argument('--disorder', type=float, default=0.0,
+                        help='시간 순서가 뒤섞인 줄의 비율 (0~1)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generate_log(args.output, args.lines, args.danger_density, args.disorder, args.seed)
+    print(f'[INFO] {args.lines}줄 로그 생성: {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+from collections import deque
+
+# 키워드가 이보다 많을 때만 오토마톤 사용
+# (순수 Python 오토마톤은 문자마다 dict 를 조회하므로, 키워드가 적으면 C 로 구현된 `in` 반복이 더 빠름)
+AUTOMATON_THRESHOLD = 128
+
+
+# Aho-Corasick 다중 패턴 매처
+# 키워드 전체를 하나의 오토마톤으로 컴파일해 메시지를 한 번만 훑으면서
+# 모든 키워드의 등장 위치를 찾음 (str, bytes 모두 사용 가능)
+# 키워드가 AUTOMATON_THRESHOLD 개 이하면 오토마톤 대신 키워드마다 str.find 로 검사 (결과는 같음)
+# set 으로 받은 키워드는 정렬해 사용 (순회 순서가 해시 시드에 따라 달라지지 않도록)
+class KeywordMatcher:
+    def __init__(self, keywords, ignore_case=False, threshold=AUTOMATON_THRESHOLD):
+        if isinstance(keywords, (set, frozenset)):
+            keywords = sorted(keywords)
+        self.keywords = list(dict.fromkeys(keywords))
+        self.ignore_case = ignore_case
+        if not self.keywords:
+            raise ValueError('키워드가 비어 있습니다.')
+        if any(len(keyword) == 0 for keyword in self.keywords):
+            raise ValueError('빈 문자열 키워드는 사용할 수 없습니다.')
+
+        self.use_automaton = len(self.keywords) > threshold
+        if not self.use_automaton:
+            self._normalized = [self._normalize(keyword) for keyword in self.keywords]
+            return
+
+        # goto[state] : {문자: 다음 state}, outputs[state] : 끝나는 키워드 인덱스들
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [()]
+        for index, keyword in enumerate(self.keywords):
+            self._add(self._normalize(keyword), index)
+        self._build_fail_links()
+
+    def _normalize(self, text):
+        return text.lower() if self.ignore_case else text
+
+    def _add(self, keyword, index):
+        state = 0
+        for ch in keyword:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append(())
+            state = next_state
+        self._outputs[state] += (index,)
+
+    # BFS 로 실패 링크를 만들고, 실패 링크 쪽 출력도 미리 합쳐 둠
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(ch, 0)
+                self._fail[next_state] = fail
+                self._outputs[next_state] += self._outputs[fail]
+
+    # (끝 위치, 키워드) 를 등장 순서대로 반환
+    def iter_matches(self, text):
+        if not self.use_automaton:
+            yield from self._scan_matches(text)
+            return
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        keywords = self.keywords
+        state = 0
+        for pos, ch in enumerate(self._normalize(text)):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in outputs[state]:
+                yield pos, keywords[index]
+
+    # 키워드마다 str.find 로 모든 등장 위치를 찾아 오토마톤과 같은 순서로 정렬
+    # (끝 위치가 같으면 긴 키워드 먼저, 그다음 키워드 목록 순서)
+    def _scan_matches(self, text):
+        text = self._normalize(text)
+        matches = []
+        for index, normalized in enumerate(self._normalized):
+            pos = text.find(normalized)
+            while pos >= 0:
+                matches.append((pos + len(normalized) - 1, -len(normalized), index))
+                pos = text.find(normalized, pos + 1)
+        matches.sort()
+        return [(end, self.keywords[index]) for end, _, index in matches]
+
+    # 정규화한 text 에서 키워드마다 처음 끝나는 위치를 (끝 위치, -길이, 키워드 인덱스) 로 반환
+    # (포함되지 않은 키워드는 제외, 정렬하면 오토마톤이 키워드를 찾는 순서와 같음)
+    def _first_ends(self, text):
+        ends = []
+        for index, normalized in enumerate(self._normalized):
+            pos = text.find(normalized)
+            if pos >= 0:
+                ends.append((pos + len(normalized) - 1, -len(normalized), index))
+        return ends
+
+    # 정규화한 text 에서 가장 먼저 끝나는 키워드 (끝 위치가 같으면 긴 키워드)
+    def _earliest(self, text):
+        ends = self._first_ends(text)
+        return self.keywords[min(ends)[2]] if ends else None
+
+    # 메시지에 포함된 키워드 목록 (처음 등장한 순서, 중복 제거)
+    def find_keywords(self, text):
+        if not self.use_automaton:
+            if self.ignore_case:
+                text = text.lower()
+            # 대부분의 메시지는 어느 키워드도 포함하지 않으므로 `in` 으로 먼저 확인
+            for normalized in self._normalized:
+                if normalized in text:
+                    return [self.keywords[index] for _, _, index in sorted(self._first_ends(text))]
+            return []
+        return list(dict.fromkeys(keyword for _, keyword in self.iter_matches(text)))
+
+    # items 중 키워드가 포함된 항목을 (item, search 와 같은 키워드) 로 반환 (field 번째 값을 검사, None 이면 item 자체)
+    # 항목마다 search 를 호출하지 않고 한 루프에서 검사하므로 필터링처럼 많은 메시지를 훑을 때 사용
+    def match_items(self, items, field=None):
+        if self.use_automaton:
+            for item in items:
+                keyword = self.search(item if field is None else item[field])
+                if keyword is not None:
+                    yield item, keyword
+            return
+
+        normalized_keywords = self._normalized
+        ignore_case = self.ignore_case
+        for item in items:
+            text = item if field is None else item[field]
+            if ignore_case:
+                text = text.lower()
+            # 대부분의 메시지는 어느 키워드도 포함하지 않으므로 `in` 으로 먼저 확인
+            for normalized in normalized_keywords:
+                if normalized in text:
+                    yield item, self._earliest(text)
+                    break
+
+    # 포함된 키워드 하나만 반환 (없으면 None)
+    # 가장 먼저 끝나는 키워드 (끝 위치가 같으면 긴 키워드), 오토마톤을 쓰는지와 상관없이 같은 결과
+    def search(self, text):
+        if not self.use_automaton:
+            if self.ignore_case:
+                text = text.lower()
+            for normalized in self._normalized:
+                if normalized in text:
+                    return self._earliest(text)
+            return None
+        for _, keyword in self.iter_matches(text):
+            return keyword
+        return None
@@ -0,0 +1,76 @@
+import heapq
+import itertools
+import os
+from operator import itemgetter
+
+READ_BLOCK = 64 * 1024
+
+_epoch_key = itemgetter(0)
+
+
+# 파일을 끝에서부터 블록 단위로 읽어 줄을 역순으로 반환 (메모리는 블록 하나 + 줄 하나)
+# 맨 앞의 헤더 줄은 건너뜀
+def iter_lines_reversed(file, block_size=READ_BLOCK):
+    with open(file, 'rb') as f:
+        start = 0
+        first = f.readline()
+        if first.strip().lower().startswith(b'timestamp,'):
+            start = len(first)
+
+        pos = f.seek(0, os.SEEK_END)
+        tail = b''
+        while pos > start:
+            size = min(block_size, pos - start)
+            pos -= size
+            f.seek(pos)
+            lines = (f.read(size) + tail).split(b'\n')
+            # 블록 첫 조각은 앞 블록에 이어지는 줄일 수 있으므로 다음 블록과 합침
+            tail = lines[0]
+            for line in reversed(lines[1:]):
+                yield line.decode('utf-8')
+        if tail:
+            yield tail.decode('utf-8')
+
+
+# 시간 순으로 기록된 로그를 끝에서부터 읽어 (epoch, item) 을 시간 역순으로 반환
+# parse_items 는 줄 iterable 을 (epoch, item) 으로 바꾸는 함수
+# 같은 시각의 레코드는 파일에 적힌 순서를 유지 (sort_list 의 안정 정렬과 같은 순서)
+class ReversedLog:
+    def __init__(self, file, parse_items):
+        self.file = file
+        self.parse_items = parse_items
+
+    def __iter__(self):
+        for _, item in self.keyed():
+            yield item
+
+    def keyed(self):
+        keyed_items = self.parse_items(iter_lines_reversed(self.file))
+        for _, group in itertools.groupby(keyed_items, key=_epoch_key):
+            yield from reversed(list(group))
+
+
+# 각각 시간 역순으로 정렬된 소스(ReversedLog, ExternalSortedRuns)를 heap 으로 k-way 병합
+# heap 에는 소스마다 레코드 하나만 있으므로 메모리는 소스 수에 비례
+# 순회할 때마다 처음부터 다시 병합하므로 여러 단계에서 반복해서 사용할 수 있음
+class MergedLogs:
+    def __init__(self, sources):
+        self.sources = list(sources)
+
+    def __iter__(self):
+        merged = heapq.merge(*(source.keyed() for source in self.sources),
+                             key=_epoch_key, reverse=True)
+        for _, item in merged:
+            yield item
+
+    def close(self):
+        for source in self.sources:
+            close = getattr(source, 'close', None)
+            if close is not None:
+                close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
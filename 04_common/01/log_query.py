@@ -0,0 +1,197 @@
+import re
+from datetime import datetime, time
+
+import numpy as np
+
+from log_time import datetime_to_epoch_us, epoch_us_to_datetime
+
+OPERATORS = {'AND', 'OR', 'NOT'}
+TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<lparen>\() |
+        (?P<rparen>\)) |
+        (?P<field>level|after|before):(?:"(?P<field_quoted>[^"]*)"|(?P<field_value>[^\s()"]+)) |
+        "(?P<quoted>[^"]*)" |
+        (?P<word>[^\s()"]+)
+    )''', re.VERBOSE)
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+# 예) level:WARNING after:2023-08-27T11:00 before:12:00 "tank" AND NOT "nominal"
+# -> [('field', 'level', 'WARNING'), ..., ('text', 'tank'), ('op', 'AND'), ...]
+def tokenize(query):
+    tokens = []
+    pos = 0
+    query = query.rstrip()
+    while pos < len(query):
+        match = TOKEN_RE.match(query, pos)
+        if match is None or match.end() == pos:
+            raise QuerySyntaxError(f'해석할 수 없는 검색식입니다: {query[pos:]}')
+        pos = match.end()
+        if match.group('lparen'):
+            tokens.append(('lparen',))
+        elif match.group('rparen'):
+            tokens.append(('rparen',))
+        elif match.group('field'):
+            value = match.group('field_quoted')
+            if value is None:
+                value = match.group('field_value')
+            tokens.append(('field', match.group('field'), value))
+        elif match.group('quoted') is not None:
+            tokens.append(('text', match.group('quoted')))
+        elif match.group('word') in OPERATORS:
+            tokens.append(('op', match.group('word')))
+        else:
+            tokens.append(('text', match.group('word')))
+    return tokens
+
+
+# 검색식을 트리로 변환 (NOT > AND > OR 순으로 결합, 연산자가 없으면 AND)
+# 노드: ('or', [...]), ('and', [...]), ('not', node), ('text', s), ('level', s),
+#       ('after', 값), ('before', 값)
+def parse_query(query):
+    tokens = tokenize(query)
+    if not tokens:
+        raise QuerySyntaxError('검색식이 비어 있습니다.')
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def parse_or():
+        nonlocal pos
+        nodes = [parse_and()]
+        while peek() == ('op', 'OR'):
+            pos += 1
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ('or', nodes)
+
+    def parse_and():
+        nonlocal pos
+        nodes = [parse_unary()]
+        while peek() is not None and peek() not in (('op', 'OR'), ('rparen',)):
+            if peek() == ('op', 'AND'):
+                pos += 1
+            nodes.append(parse_unary())
+        return nodes[0] if len(nodes) == 1 else ('and', nodes)
+
+    def parse_unary():
+        nonlocal pos
+        token = peek()
+        if token is None:
+            raise QuerySyntaxError('검색식이 중간에 끝났습니다.')
+        pos += 1
+        if token == ('op', 'NOT'):
+            return ('not', parse_unary())
+        if token == ('lparen',):
+            node = parse_or()
+            if peek() != ('rparen',):
+                raise QuerySyntaxError("')' 가 필요합니다.")
+            pos += 1
+            return node
+        if token[0] == 'field':
+            return (token[1], token[2])
+        if token[0] == 'text':
+            return token
+        raise QuerySyntaxError(f'예상하지 못한 위치의 토큰입니다: {token[-1]}')
+
+    node = parse_or()
+    if pos != len(tokens):
+        raise QuerySyntaxError(f'예상하지 못한 위치의 토큰입니다: {tokens[pos][-1]}')
+    return node
+
+
+# 시간 값 해석: 날짜+시간, 날짜만(자정), 시간만(기준 날짜와 결합)
+def resolve_time(value, reference_date):
+    try:
+        return datetime_to_epoch_us(datetime.fromisoformat(value))
+    except ValueError:
+        pass
+    try:
+        clock = time.fromisoformat(value)
+    except ValueError:
+        raise QuerySyntaxError(f'시간 형식이 올바르지 않습니다: {value}')
+    if reference_date is None:
+        raise QuerySyntaxError(f'날짜를 알 수 없어 시간만으로는 검색할 수 없습니다: {value}')
+    return datetime_to_epoch_us(datetime.combine(reference_date, clock))
+
+
+def _date_values(node):
+    if node[0] in ('after', 'before'):
+        try:
+            yield datetime.fromisoformat(node[1]).date()
+        except ValueError:
+            pass
+    elif node[0] in ('and', 'or'):
+        for child in node[1]:
+            yield from _date_values(child)
+    elif node[0] == 'not':
+        yield from _date_values(node[1])
+
+
+# 시간만 있는 값은 검색식 안의 다른 날짜, 없으면 로그 첫 레코드의 날짜를 기준으로 해석
+def resolve_times(node, reference_date):
+    kind = node[0]
+    if kind in ('after', 'before'):
+        return (kind, resolve_time(node[1], reference_date))
+    if kind in ('and', 'or'):
+        return (kind, [resolve_times(child, reference_date) for child in node[1]])
+    if kind == 'not':
+        return (kind, resolve_times(node[1], reference_date))
+    return node
+
+
+# [lo, hi) 행 범위에서 노드를 평가해 길이 hi - lo 의 mask 반환
+def evaluate(node, store, lo, hi):
+    kind = node[0]
+    if kind == 'text':
+        return store.contains_mask_range(node[1], lo, hi)
+    if kind == 'level':
+        wanted = node[1].upper()
+        codes = [code for code, name in enumerate(store.level_names) if name.upper() == wanted]
+        return np.isin(store.levels[lo:hi], codes)
+    if kind == 'after':
+        return store.epochs[lo:hi] >= node[1]
+    if kind == 'before':
+        return store.epochs[lo:hi] < node[1]
+    if kind == 'not':
+        return ~evaluate(node[1], store, lo, hi)
+    if kind == 'and':
+        mask = np.ones(hi - lo, dtype=bool)
+        for child in node[1]:
+            mask &= evaluate(child, store, lo, hi)
+            if not mask.any():
+                break
+        return mask
+    if kind == 'or':
+        mask = np.zeros(hi - lo, dtype=bool)
+        for child in node[1]:
+            mask |= evaluate(child, store, lo, hi)
+        return mask
+    raise QuerySyntaxError(f'알 수 없는 검색 조건입니다: {kind}')
+
+
+# 최상위 AND 에 있는 after/before 는 이분 탐색으로 행 범위를 줄이는 데 사용하고
+# 나머지 조건만 그 범위 안에서 mask 로 평가
+def run_query(store, query):
+    node = parse_query(query)
+    dates = list(_date_values(node))
+    if dates:
+        reference_date = dates[0]
+    elif len(store):
+        reference_date = epoch_us_to_datetime(int(store.epochs[0])).date()
+    else:
+        reference_date = None
+    node = resolve_times(node, reference_date)
+
+    conjuncts = node[1] if node[0] == 'and' else [node]
+    start = max((child[1] for child in conjuncts if child[0] == 'after'), default=None)
+    end = min((child[1] for child in conjuncts if child[0] == 'before'), default=None)
+    rest = [child for child in conjuncts if child[0] not in ('after', 'before')]
+
+    lo, hi = store.time_range(start, end)
+    mask = evaluate(('and', rest), store, lo, hi)
+    return np.flatnonzero(mask) + lo
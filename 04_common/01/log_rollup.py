@@ -0,0 +1,261 @@
+from collections import Counter
+from datetime import timedelta
+
+from log_time import EPOCH, datetime_to_epoch, parse_timestamp
+
+# 단계 이름과 그 단계가 시작되는 메시지 문구 (로그에 등장하는 순서대로)
+PHASE_RULES = (
+    ('발사 준비 단계', 'initialization process started'),
+    ('이륙 및 상승 단계', 'Liftoff!'),
+    ('궤도 진입 및 임무 수행', 'Orbital insertion'),
+    ('로켓 귀환 및 착륙 단계', 'deorbit'),
+    ('임무 완료 및 사고 발생', 'Mission completed'),
+)
+TOP_MINUTES = 5
+
+
+# 로그를 한 번 훑으면서 보고서에 필요한 집계를 모두 계산
+# - 분/시간 단위 레벨별 이벤트 수 (epoch // 60, epoch // 3600 정수로 세고 to_dict 에서 시각 문자열로 변환)
+# - 위험 키워드별 첫/마지막 발생 로그
+# - PHASE_RULES 기준 단계별 시작/끝 시각
+class LogRollup:
+    def __init__(self, matcher, phase_rules=PHASE_RULES):
+        self.matcher = matcher
+        self.phase_rules = phase_rules
+        self.total = 0
+        self.first = None
+        self.last = None
+        self.last_record = None
+        self.per_minute = Counter()
+        self.per_hour = Counter()
+        self.levels = Counter()
+        self.danger_count = 0
+        self.danger_first = {}
+        self.danger_last = {}
+        self.phases = []
+        self._phase_index = -1
+
+    def add(self, timestamp, event, message):
+        try:
+            dt = parse_timestamp(timestamp)
+        except (ValueError, TypeError):
+            return
+        self.total += 1
+        if self.first is None or dt < self.first:
+            self.first = dt
+        if self.last is None or dt >= self.last:
+            self.last = dt
+            self.last_record = (timestamp, message)
+        epoch = datetime_to_epoch(dt)
+        self.per_minute[(epoch // 60, event)] += 1
+        self.per_hour[(epoch // 3600, event)] += 1
+        self.levels[event] += 1
+
+        keywords = self.matcher.find_keywords(message)
+        if keywords:
+            self.danger_count += 1
+        for keyword in keywords:
+            hit = (dt, timestamp, message)
+            first = self.danger_first.get(keyword)
+            if first is None or dt < first[0]:
+                self.danger_first[keyword] = hit
+            last = self.danger_last.get(keyword)
+            if last is None or dt >= last[0]:
+                self.danger_last[keyword] = hit
+
+        self._track_phase(dt, message)
+
+    # 다음 단계의 시작 문구가 나오면 단계를 넘기고, 현재 단계의 시작/끝 시각을 갱신
+    def _track_phase(self, dt, message):
+        for index in range(self._phase_index + 1, len(self.phase_rules)):
+            name, marker = self.phase_rules[index]
+            if marker in message:
+                self._phase_index = index
+                self.phases.append({'name': name, 'start': dt, 'end': dt, 'records': 0})
+                break
+        if self.phases:
+            phase = self.phases[-1]
+            phase['start'] = min(phase['start'], dt)
+            phase['end'] = max(phase['end'], dt)
+            phase['records'] += 1
+
+    # 레코드를 그대로 넘겨주면서 집계 (다른 단계와 같은 스트리밍 패스에서 사용)
+    def track(self, records):
+        for record in records:
+            self.add(*record)
+            yield record
+
+    def to_dict(self):
+        def fmt(dt):
+            return None if dt is None else f'{dt:%Y-%m-%d %H:%M:%S}'
+
+        def nested(counter, seconds, label):
+            result = {}
+            for (bucket, event), count in sorted(counter.items()):
+                result.setdefault(f'{EPOCH + timedelta(seconds=bucket * seconds):{label}}',
+                                  {})[event] = count
+            return result
+
+        def hits(by_keyword):
+            return {keyword: {'timestamp': timestamp, 'message': message}
+                    for keyword, (_, timestamp, message) in by_keyword.items()}
+
+        return {
+            'total': self.total,
+            'first': fmt(self.first),
+            'last': fmt(self.last),
+            'levels': dict(self.levels.most_common()),
+            'last_record': None if self.last_record is None else {
+                'timestamp': self.last_record[0], 'message': self.last_record[1]},
+            'per_hour': nested(self.per_hour, 3600, '%Y-%m-%d %H:00'),
+            'per_minute': nested(self.per_minute, 60, '%Y-%m-%d %H:%M'),
+            'danger_count': self.danger_count,
+            'danger_first': hits(self.danger_first),
+            'danger_last': hits(self.danger_last),
+            'phases': [
+                {**phase, 'start': fmt(phase['start']), 'end': fmt(phase['end'])}
+                for phase in self.phases
+            ],
+        }
+
+
+def _minutes_between(start, end):
+    return round((parse_timestamp(end) - parse_timestamp(start)).total_seconds() / 60)
+
+
+# 마지막 단계가 시작된 뒤의 위험 키워드 로그를 사고 징후로 보고 시각 순으로 모음
+# (단계 구분이 없으면 모든 위험 키워드 로그) -> [(timestamp, message, [키워드...])]
+def _incident_hits(rollup):
+    since = rollup['phases'][-1]['start'] if rollup['phases'] else None
+    hits = {}
+    for by_keyword in (rollup['danger_first'], rollup['danger_last']):
+        for keyword, hit in by_keyword.items():
+            if since is not None and parse_timestamp(hit['timestamp']) < parse_timestamp(since):
+                continue
+            keywords = hits.setdefault((hit['timestamp'], hit['message']), [])
+            if keyword not in keywords:
+                keywords.append(keyword)
+    return sorted(((timestamp, message, keywords)
+                   for (timestamp, message), keywords in hits.items()),
+                  key=lambda hit: parse_timestamp(hit[0]))
+
+
+# 단계 집계와 사고 징후로 사고 경위를 순서대로 서술
+def _incident_reasoning(rollup, incident):
+    if not rollup['total']:
+        return ['분석할 로그가 없습니다.']
+    if not incident:
+        return ['위험 키워드가 포함된 로그가 없어 사고 경위를 추론할 수 없습니다.']
+
+    lines = []
+    step = 1
+    phases = rollup['phases'][:-1]
+    if phases:
+        since = parse_timestamp(rollup['phases'][-1]['start'])
+        early = sorted(keyword for keyword, hit in rollup['danger_first'].items()
+                       if parse_timestamp(hit['timestamp']) < since)
+        detail = (f" 이 구간에서 기록된 위험 키워드: {', '.join(early)}." if early
+                  else ' 이 구간에는 위험 키워드가 없습니다.')
+        lines += [f'{step}. **정상 진행 구간**  ',
+                  f"   - {phases[0]['start']} ~ {phases[-1]['end']} 동안 다음 단계가 순서대로 진행됨: "
+                  f"{', '.join(phase['name'] for phase in phases)}.{detail}", '']
+        step += 1
+
+    previous = None
+    for timestamp, message, keywords in incident:
+        after = '' if previous is None else f' (이전 징후 {_minutes_between(previous, timestamp)}분 후)'
+        title = '첫 이상 징후 발생' if previous is None else '이상 징후 확대'
+        lines += [f'{step}. **{title}**  ',
+                  f"   - {timestamp}{after}: `“{message}”` ({', '.join(keywords)})", '']
+        previous = timestamp
+        step += 1
+
+    last = rollup['last_record']
+    if last is not None and last['timestamp'] != previous:
+        minutes = _minutes_between(previous, last['timestamp'])
+        lines += [f'{step}. **마지막 기록**  ',
+                  f"   - {last['timestamp']} (마지막 징후 {minutes}분 후): `“{last['message']}”`", '']
+    return lines[:-1] if lines and lines[-1] == '' else lines
+
+
+def _conclusion(rollup, incident):
+    if not incident:
+        return ['로그 전체에서 사고로 볼 만한 위험 징후가 감지되지 않았습니다.']
+    first_timestamp = incident[0][0]
+    keywords = list(dict.fromkeys(keyword for _, _, hit_keywords in incident
+                                  for keyword in hit_keywords))
+    phase = f"마지막 단계인 '{rollup['phases'][-1]['name']}' 에서 " if rollup['phases'] else ''
+    return [f"{rollup['first']} 에 시작된 로그는 {phase}{first_timestamp} 에 처음 위험 징후"
+            f"({', '.join(keywords)})를 기록했고, {rollup['last']} 까지 "
+            f"{_minutes_between(first_timestamp, rollup['last'])}분 동안 "
+            f"{len(incident)}건의 위험 로그가 이어졌습니다. "
+            '임무의 성공 여부는 발사부터 회수 후 안정화 단계까지 모든 과정이 안전하게 '
+            '종료되어야만 판단할 수 있으므로, 위 징후가 처음 나타난 시점 전후의 장비 상태를 우선 점검해야 합니다.']
+
+
+# 집계 결과(to_dict)로 사고 분석 보고서 markdown 생성
+def render_report(rollup):
+    lines = ['', '# 사고 원인 분석 보고서', '', '']
+
+    lines += ['## 1. 개요', '']
+    if rollup['total']:
+        lines.append(f"{rollup['first']} ~ {rollup['last']} 동안 mission computer 에서 기록된 "
+                     f"로그 {rollup['total']:,}건을 집계해 자동으로 작성된 보고서입니다.")
+        levels = ', '.join(f'{event} {count:,}건' for event, count in rollup['levels'].items())
+        lines += ['', f'- 이벤트 레벨: {levels}',
+                  f"- 위험 키워드가 포함된 로그: {rollup['danger_count']:,}건"]
+    else:
+        lines.append('분석할 로그가 없습니다.')
+    lines += ['', '---', '']
+
+    lines += ['## 2. 로그 요약', '']
+    if rollup['phases']:
+        for phase in rollup['phases']:
+            lines.append(f"- {phase['name']} ({phase['start']} ~ {phase['end']}, "
+                         f"{phase['records']:,}건)")
+    else:
+        lines.append('- 단계 구분 문구가 로그에 없습니다.')
+    lines += ['', '---', '']
+
+    lines += ['## 3. 주요 이상 징후', '']
+    if rollup['danger_first']:
+        first_hits = sorted(rollup['danger_first'].items(), key=lambda item: item[1]['timestamp'])
+        for number, (keyword, first) in enumerate(first_hits, 1):
+            last = rollup['danger_last'][keyword]
+            lines += [
+                f'{number}. **{keyword}**  ',
+                f"   - **처음 발생:** {first['timestamp']}  ",
+                f"   - **로그:** `“{first['message']}”`  ",
+                f"   - **마지막 발생:** {last['timestamp']}  ",
+                f"   - **로그:** `“{last['message']}”`",
+                '',
+            ]
+    else:
+        lines += ['위험 키워드가 포함된 로그가 없습니다.', '']
+    lines += ['---', '']
+
+    incident = _incident_hits(rollup)
+    lines += ['## 4. 사고 경위 추론', '']
+    lines += _incident_reasoning(rollup, incident)
+    lines += ['', '---', '']
+
+    lines += ['## 5. 결론', '']
+    lines += _conclusion(rollup, incident)
+    lines += ['', '---', '']
+
+    lines += ['## 부록 A. 시간대별 이벤트 수', '']
+    events = sorted(rollup['levels'])
+    lines += ['| 시간 | ' + ' | '.join(events) + ' |',
+              '|---|' + '---|' * len(events)]
+    for hour, counts in rollup['per_hour'].items():
+        lines.append(f'| {hour} | ' + ' | '.join(str(counts.get(event, 0)) for event in events) + ' |')
+    lines += ['', '---', '']
+
+    lines += ['## 부록 B. 로그가 가장 많은 분', '']
+    busiest = sorted(rollup['per_minute'].items(),
+                     key=lambda item: (-sum(item[1].values()), item[0]))[:TOP_MINUTES]
+    for minute, counts in busiest:
+        lines.append(f'- {minute}: {sum(counts.values()):,}건')
+    lines.append('')
+
+    return '\n'.join(lines)
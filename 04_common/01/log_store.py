@@ -0,0 +1,207 @@
+import json
+from array import array
+
+import numpy as np
+
+# 이벤트 레벨 기본 코드표 (처음 보는 레벨은 뒤에 추가)
+DEFAULT_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+MAX_LEVELS = 256
+
+
+# buffer[offsets[i]:offsets[i + 1]] 조각 중 indices 의 조각만 모아 (새 buffer, 새 offsets) 반환
+def _gather(buffer, offsets, indices):
+    starts = offsets[:-1][indices]
+    lengths = offsets[1:][indices] - starts
+    new_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+
+    source = np.frombuffer(buffer, dtype=np.uint8)
+    gather = (np.arange(new_offsets[-1], dtype=np.int64)
+              + np.repeat(starts - new_offsets[:-1], lengths))
+    return source[gather].tobytes(), new_offsets
+
+
+# 로그를 열 단위로 보관하는 컨테이너
+# - epochs    : int64 epoch(마이크로초)
+# - levels    : uint8 이벤트 레벨 코드 (level_names 의 인덱스)
+# - buffer    : 모든 메시지를 이어 붙인 UTF-8 바이트
+# - offsets   : int64, i 번째 메시지는 buffer[offsets[i]:offsets[i + 1]]
+# - ts_buffer : 로그에 적힌 그대로의 timestamp 를 이어 붙인 UTF-8 바이트
+# - ts_offsets: int64, i 번째 timestamp 는 ts_buffer[ts_offsets[i]:ts_offsets[i + 1]]
+class LogStore:
+    def __init__(self, epochs, levels, level_names, buffer, offsets, ts_buffer, ts_offsets):
+        self.epochs = epochs
+        self.levels = levels
+        self.level_names = list(level_names)
+        self.buffer = buffer
+        self.offsets = offsets
+        self.ts_buffer = ts_buffer
+        self.ts_offsets = ts_offsets
+
+    # (epoch, timestamp, event, message) 레코드 스트림으로부터 생성
+    @classmethod
+    def from_records(cls, records):
+        level_names = list(DEFAULT_LEVELS)
+        level_codes = {name: code for code, name in enumerate(level_names)}
+        epochs = array('q')
+        levels = array('B')
+        offsets = array('q', [0])
+        buffer = bytearray()
+        ts_offsets = array('q', [0])
+        ts_buffer = bytearray()
+
+        for epoch, timestamp, event, message in records:
+            code = level_codes.get(event)
+            if code is None:
+                if len(level_names) >= MAX_LEVELS:
+                    raise ValueError('이벤트 레벨 종류가 너무 많습니다.')
+                code = len(level_names)
+                level_codes[event] = code
+                level_names.append(event)
+            epochs.append(epoch)
+            levels.append(code)
+            buffer += message.encode('utf-8')
+            offsets.append(len(buffer))
+            ts_buffer += timestamp.encode('utf-8')
+            ts_offsets.append(len(ts_buffer))
+
+        return cls(
+            np.frombuffer(epochs, dtype=np.int64),
+            np.frombuffer(levels, dtype=np.uint8),
+            level_names,
+            bytes(buffer),
+            np.frombuffer(offsets, dtype=np.int64),
+            bytes(ts_buffer),
+            np.frombuffer(ts_offsets, dtype=np.int64),
+        )
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def __repr__(self):
+        return (f'LogStore(records={len(self)}, '
+                f'message_bytes={len(self.buffer)}, levels={self.level_names})')
+
+    # JSON / 위험 로그 출력과 호환되도록 (timestamp, message) 쌍으로 순회
+    # (timestamp 는 로그에 적힌 문자열 그대로라 다른 경로의 출력과 같음)
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.timestamp(i), self.message(i)
+
+    def timestamps(self):
+        return [self.timestamp(i) for i in range(len(self))]
+
+    def timestamp(self, i):
+        return self.ts_buffer[self.ts_offsets[i]:self.ts_offsets[i + 1]].decode('utf-8')
+
+    def message(self, i):
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].decode('utf-8')
+
+    def level(self, i):
+        return self.level_names[self.levels[i]]
+
+    # 주어진 행 인덱스만 골라 새 LogStore 생성 (메시지/timestamp 바이트도 한 번에 모음)
+    def take(self, indices):
+        indices = np.asarray(indices, dtype=np.int64)
+        buffer, offsets = _gather(self.buffer, self.offsets, indices)
+        ts_buffer, ts_offsets = _gather(self.ts_buffer, self.ts_offsets, indices)
+        return LogStore(
+            self.epochs[indices],
+            self.levels[indices],
+            self.level_names,
+            buffer,
+            offsets,
+            ts_buffer,
+            ts_offsets,
+        )
+
+    # 시간 역순 정렬 (같은 시간은 원래 순서 유지)
+    def sort_desc(self):
+        return self.take(np.argsort(-self.epochs, kind='stable'))
+
+    # 시간 순 정렬 (시간 범위를 이분 탐색할 때 사용)
+    def sort_asc(self):
+        return self.take(np.argsort(self.epochs, kind='stable'))
+
+    # epochs 가 오름차순일 때 [start, end) 시간 범위에 해당하는 행 범위
+    def time_range(self, start=None, end=None):
+        lo = 0 if start is None else int(np.searchsorted(self.epochs, start, side='left'))
+        hi = len(self) if end is None else int(np.searchsorted(self.epochs, end, side='left'))
+        return lo, max(lo, hi)
+
+    # npz 파일로 저장 (meta 는 원본 로그 지문 등 JSON 으로 저장할 정보)
+    def save(self, path, meta=None):
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                epochs=self.epochs,
+                levels=self.levels,
+                offsets=self.offsets,
+                buffer=np.frombuffer(self.buffer, dtype=np.uint8),
+                ts_offsets=self.ts_offsets,
+                ts_buffer=np.frombuffer(self.ts_buffer, dtype=np.uint8),
+                level_names=np.array(json.dumps(self.level_names)),
+                meta=np.array(json.dumps(meta)),
+            )
+
+    # 저장된 npz 파일에서 (LogStore, meta) 로드
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            store = cls(
+                data['epochs'],
+                data['levels'],
+                json.loads(str(data['level_names'])),
+                data['buffer'].tobytes(),
+                data['offsets'],
+                data['ts_buffer'].tobytes(),
+                data['ts_offsets'],
+            )
+            meta = json.loads(str(data['meta']))
+        return store, meta
+
+    # 메시지에 pattern 이 포함된 행을 True 로 표시한 mask
+    # ignore_case 는 바이트 단위로 비교하므로 ASCII 문자에만 적용됨
+    def contains_mask(self, pattern, ignore_case=False):
+        return self.any_contains_mask([pattern], ignore_case)
+
+    # 키워드 중 하나라도 포함된 행의 mask
+    def any_contains_mask(self, patterns, ignore_case=False):
+        haystack = self.buffer.lower() if ignore_case else self.buffer
+        mask = np.zeros(len(self), dtype=bool)
+        for pattern in patterns:
+            needle = pattern.encode('utf-8')
+            if ignore_case:
+                needle = needle.lower()
+            self._mark_matches(mask, haystack, needle, 0, len(self))
+        return mask
+
+    # [lo, hi) 행 범위에서만 pattern 을 찾아 길이 hi - lo 의 mask 반환
+    def contains_mask_range(self, pattern, lo, hi):
+        mask = np.zeros(hi - lo, dtype=bool)
+        self._mark_matches(mask, self.buffer, pattern.encode('utf-8'), lo, hi)
+        return mask
+
+    def _mark_matches(self, mask, haystack, needle, lo, hi):
+        if not needle:
+            mask[:] = True
+            return
+
+        start = int(self.offsets[lo])
+        end = int(self.offsets[hi])
+        positions = []
+        pos = haystack.find(needle, start, end)
+        while pos != -1:
+            positions.append(pos)
+            pos = haystack.find(needle, pos + 1, end)
+        if not positions:
+            return
+
+        positions = np.asarray(positions, dtype=np.int64)
+        rows = np.searchsorted(self.offsets, positions, side='right') - 1
+        # 메시지 경계를 넘어가는 일치는 제외
+        inside = positions + len(needle) <= self.offsets[rows + 1]
+        mask[rows[inside] - lo] = True
+
+    def filter(self, mask):
+        return self.take(np.flatnonzero(mask))
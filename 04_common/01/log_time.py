@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+
+EPOCH = datetime(1970, 1, 1)
+SECOND = timedelta(seconds=1)
+MICROSECOND = timedelta(microseconds=1)
+# 정렬 키(epoch 마이크로초) 1초의 크기
+US_PER_SECOND = 1_000_000
+
+
+# 시간대가 있는 datetime 은 UTC 로 바꾼 뒤 시간대 정보를 뗌 (시간대가 없으면 그대로)
+def to_naive_utc(dt):
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+# 타임스탬프 문자열을 UTC 기준 datetime 으로 변환
+def parse_timestamp(timestamp):
+    return to_naive_utc(datetime.fromisoformat(timestamp))
+
+
+# datetime 을 정수 epoch(초)로 변환 (초 미만은 버림, 출력 파일의 epoch 값과 분/시간 집계에 사용)
+def datetime_to_epoch(dt):
+    return (to_naive_utc(dt) - EPOCH) // SECOND
+
+
+# datetime 을 정렬 키로 쓸 정수 epoch(마이크로초)로 변환
+# (초 단위로 자르면 같은 초 안의 .100 과 .900 의 순서가 사라짐)
+def datetime_to_epoch_us(dt):
+    return (to_naive_utc(dt) - EPOCH) // MICROSECOND
+
+
+def epoch_us_to_datetime(epoch_us):
+    return EPOCH + timedelta(microseconds=epoch_us)
+
+
+# 타임스탬프 문자열을 정수 epoch(초)로 변환
+def to_epoch(timestamp):
+    return datetime_to_epoch(datetime.fromisoformat(timestamp))
+
+
+# 타임스탬프 문자열을 정렬 키로 쓸 정수 epoch(마이크로초)로 변환
+def to_epoch_us(timestamp):
+    return datetime_to_epoch_us(datetime.fromisoformat(timestamp))
+
+
+# 'YYYY-MM-DD HH:MM:SS' 형식은 바이트에서 바로 숫자를 읽고, 그 외 형식만 디코딩해 파싱
+def bytes_to_epoch_us(raw):
+    raw = raw.strip()
+    if len(raw) == 19 and raw[4:5] == b'-' and raw[7:8] == b'-' and raw[13:14] == b':':
+        dt = datetime(int(raw[0:4]), int(raw[5:7]), int(raw[8:10]),
+                      int(raw[11:13]), int(raw[14:16]), int(raw[17:19]))
+    else:
+        dt = datetime.fromisoformat(raw.decode('utf-8'))
+    return datetime_to_epoch_us(dt)
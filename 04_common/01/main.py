@@ -1,8 +1,34 @@
 import os
+import heapq
+import itertools
 import logging
 import json
-from datetime import datetime
-import pprint
+import argparse
+import contextlib
+import glob
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+import numpy as np
+
+from bloom_index import BlockBloomIndex, iter_block_lines
+from compressed_log import detect_compression, iter_gzip_lines_parallel, open_log_text
+from external_sort import DEFAULT_BUFFER_RECORDS, external_sort
+from keyword_matcher import KeywordMatcher
+from log_merge import READ_BLOCK, MergedLogs, ReversedLog
+from log_query import QuerySyntaxError, run_query
+from log_rollup import LogRollup, render_report
+from log_store import LogStore
+from log_time import US_PER_SECOND, to_epoch, to_epoch_us
+from mmap_reader import MappedLog, MappedRecords
+from record_output import (TimestampMultimap, iter_json_entries, ndjson_line, ndjson_upper_bound,
+                           read_json_entries, write_binary_records, write_json_object,
+                           write_ndjson)
+from sensor_join import asof_join, iter_sensor_readings, write_joined
+from trigram_index import TrigramIndex, file_fingerprint
 
 BASE_DIR = os.path.dirname(__file__)
 
@@ -10,34 +36,116 @@ LOG_FILE = os.path.join(BASE_DIR, 'mission_computer_main.log')
 JSON_FILE = os.path.join(BASE_DIR, 'mission_computer_main.json')
 MARKDOWN_FILE = os.path.join(BASE_DIR, 'log_analysis.md')
 DANGER_FILE = os.path.join(BASE_DIR, 'danger_logs.txt')
+TRIGRAM_FILE = os.path.join(BASE_DIR, 'mission_computer_main.trigram')
+STATE_FILE = os.path.join(BASE_DIR, 'mission_computer_main.state.json')
+NDJSON_FILE = os.path.join(BASE_DIR, 'mission_computer_main.jsonl')
+FOLLOW_RECORDS_FILE = os.path.join(BASE_DIR, 'mission_computer_main.follow.jsonl')
+FOLLOW_DANGER_FILE = os.path.join(BASE_DIR, 'mission_computer_main.follow-danger.jsonl')
+BINARY_FILE = os.path.join(BASE_DIR, 'mission_computer_main.bin')
+ROLLUP_FILE = os.path.join(BASE_DIR, 'mission_computer_main.rollup.json')
+STORE_FILE = os.path.join(BASE_DIR, 'mission_computer_main.store.npz')
+SENSOR_LOG = os.path.join(BASE_DIR, '..', '03', 'mars_sensor_log.txt')
+SENSOR_JOIN_FILE = os.path.join(BASE_DIR, 'mission_computer_main.sensor.jsonl')
 
 DANGER_KEYWORDS = {'unstable', 'explosion', 'Max-Q', 'ignition', 'Oxygen'}
+DANGER_MATCHER = KeywordMatcher(DANGER_KEYWORDS)
+
+# 요청할 수 있는 출력 (실행 순서)
+OUTPUTS = ('danger', 'json', 'search', 'report')
+# 단계마다 콘솔에 미리 보여줄 항목 수 기본값
+DEFAULT_PREVIEW = 10
+
+# 여러 member 로 된 gzip 로그를 해제할 프로세스 수 (None 이면 스트리밍으로 순차 해제)
+DECOMPRESS_WORKERS = None
+
+
+# 빈 줄과 맨 앞의 헤더를 제외한 로그 줄만 통과시킴
+def clean_log_lines(lines):
+    header_checked = False
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if not header_checked:
+            header_checked = True
+            if line.lower().startswith('timestamp,'):
+                continue
+        yield line
+
+
+# gzip/bz2/xz 압축 로그도 디스크에 풀지 않고 한 줄씩 읽음
+def iter_raw_lines(file):
+    if DECOMPRESS_WORKERS and detect_compression(file) == 'gzip':
+        yield from iter_gzip_lines_parallel(file, DECOMPRESS_WORKERS)
+        return
+    with open_log_text(file) as f:
+        yield from f
+
+
+# 로그 파일을 한 줄씩 읽어 빈 줄과 헤더를 제외하고 반환 (파일 전체를 메모리에 올리지 않음)
+def iter_log_lines(file):
+    yield from clean_log_lines(iter_raw_lines(file))
+
+
+# 로그 줄을 (timestamp, event, message) 레코드로 변환
+def parse_log_lines(lines):
+    for log in lines:
+        parts = log.split(',', 2)
+        if len(parts) != 3:
+            logging.warning('[ERROR] 파일 형식 불일치 (3분할 실패)')
+            continue
+
+        timestamp, event, message = parts
+        yield timestamp.strip(), event.strip(), message.strip()
+
+
+# 로그 한 줄씩 (timestamp, event, message) 레코드로 변환
+def iter_records(file):
+    return parse_log_lines(iter_log_lines(file))
 
 
 # mission_computer_main.log 파일 읽고 출력
-def read_file(file):
+def read_file(file, sort_buffer=None):
     try:
-        with open(file, 'r', encoding='utf-8') as f:
-            contents = f.read()
         print('---------------print log file---------------')
-        print(contents)
+        for line in iter_raw_lines(file):
+            print(line, end='')
+        print()
+
+        print('---------------print sorted log file---------------')
+        for timestamp, event, message in sort_list(iter_records(file), sort_buffer):
+            print(f'{timestamp},{event},{message}')
+
+        return file
+    except FileNotFoundError:
+        print('[ERROR] 파일이 없습니다')
+        return
+    except UnicodeDecodeError:
+        print('[ERROR] 디코딩 오류 발생')
+        return
+    except Exception as e:
+        print(f'[ERROR] 데이터 읽는 중 알 수 없는 오류가 발생했습니다: {e}')
+        return
 
-        lines = [line.strip()
-                 for line in contents.splitlines() if line.strip()]
-        if lines and lines[0].lower().startswith('timestamp,'):
-            lines = lines[1:]
 
-        sorted_lines = sorted(
-            lines,
-            key=lambda line: datetime.fromisoformat(line.split(',', 1)[0]),
-            reverse=True
-        )
+# 처음 limit 개만 출력하고 나머지는 생략 표시 (limit 이 None 이면 모두, 0 이면 출력하지 않음)
+def print_preview(title, items, limit):
+    if limit == 0 or items is None:
+        return
+    print(f'---------------{title}---------------')
+    items = iter(items)
+    for item in itertools.islice(items, limit):
+        print(item)
+    if limit is not None and next(items, None) is not None:
+        print(f'... (처음 {limit}건만 출력)')
 
-        print('---------------print sorted log file---------------')
-        for ln in sorted_lines:
-            print(ln)
 
-        return contents
+# 로그 파일 앞부분만 출력하고, 읽을 수 없는 파일이면 None 반환
+def preview_file(file, limit=None):
+    try:
+        detect_compression(file)
+        print_preview('print log file', (line.rstrip('\n') for line in iter_raw_lines(file)), limit)
+        return file
     except FileNotFoundError:
         print('[ERROR] 파일이 없습니다')
         return
@@ -49,50 +157,206 @@ def read_file(file):
         return
 
 
-# 날짜/시간, 메시지를 list로 전환
+# 날짜/시간, 메시지를 list로 전환 (호출 시점에 파일을 다시 스트리밍으로 읽음)
 def file_to_list(file):
     if file is None:
         print('[ERROR] 파일이 존재하지 않음')
         return
 
-    logs = [log for log in file.splitlines() if log.strip()]
-    parsed = []
+    return ([timestamp, message]
+            for timestamp, event, message in iter_records(file))
+
+
+# 파일을 shards 개의 바이트 구간으로 나누되, 경계는 항상 줄의 시작 위치에 맞춤
+def split_byte_ranges(file, shards):
+    size = os.path.getsize(file)
+    bounds = [0]
+    with open(file, 'rb') as f:
+        for i in range(1, shards):
+            pos = size * i // shards
+            if pos <= bounds[-1]:
+                continue
+            f.seek(pos - 1)
+            f.readline()
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+# [start, end) 구간의 줄을 파싱해 레코드 참조 (epoch, 줄 시작, timestamp 끝, message 시작, 줄 끝) 를
+# int64 (N, 5) 배열로 반환 (ProcessPoolExecutor 작업 단위)
+# 문자열 대신 작은 고정 크기 배열만 돌려주므로 부모 프로세스로 옮기는 비용이 적음
+def parse_shard(file, start, end):
+    with MappedLog(file) as mapped:
+        return mapped.records(start, end).refs
+
+
+# 로그를 줄 단위 바이트 구간으로 나눠 여러 프로세스에서 파싱한 뒤
+# 구간 결과를 이어 붙여 epoch 기준 안정 정렬 (같은 시각은 파일 순서 유지)
+# 결과는 MappedRecords 라 출력할 때만 원본 바이트를 디코딩함 (내용은 sort_list(file_to_list(file)) 과 동일)
+def parse_sort_parallel(file, workers=None):
+    workers = workers or os.cpu_count() or 1
+    ranges = split_byte_ranges(file, workers)
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+        futures = [executor.submit(parse_shard, file, start, end)
+                   for start, end in ranges]
+        refs = np.concatenate([future.result() for future in futures])
+    return MappedRecords(MappedLog(file), refs).sort_desc()
+
+
+# 파일 이름과 glob 패턴을 로그 파일 목록으로 변환 (지정한 순서 유지, 중복 제거)
+def expand_log_files(patterns):
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            print(f'[ERROR] 일치하는 로그 파일이 없습니다: {pattern}')
+        for file in matches:
+            if file not in files:
+                files.append(file)
+    return files
+
+
+# 로그가 시간 순으로 기록되어 있는지 한 번 훑어 확인 (잘못된 타임스탬프는 건너뜀)
+def is_time_ordered(file):
+    previous = None
+    for timestamp, event, message in iter_records(file):
+        try:
+            epoch = to_epoch_us(timestamp)
+        except (ValueError, TypeError):
+            continue
+        if previous is not None and epoch < previous:
+            return False
+        previous = epoch
+    return True
 
-    start_idx = 1 if logs and logs[0].lower().startswith('timestamp,') else 0
 
-    for log in logs[start_idx:]:
-        parts = log.split(',', 2)
-        if len(parts) != 3:
-            logging.warning('[ERROR] 파일 형식 불일치 (3분할 실패)')
-            continue
+# 역순으로 읽은 로그 줄을 (epoch, [timestamp, message]) 로 변환
+def parse_reversed_lines(lines):
+    return iter_valid_items([timestamp, message] for timestamp, event, message
+                            in parse_log_lines(clean_log_lines(lines)))
 
-        timestamp, event, message = parts
-        parsed.append([timestamp.strip(), message.strip()])
 
-    return parsed
+# 여러 로그 파일을 타임스탬프 기준 시간 역순으로 병합
+# 시간 순으로 기록된 압축되지 않은 로그는 끝에서부터 읽어 그대로 병합하고,
+# 그렇지 않은 로그만 파일별로 외부 정렬한 뒤 병합 (어느 쪽도 로그 전체를 메모리에 올리지 않음)
+def merge_log_files(files, sort_buffer=None):
+    sources = []
+    try:
+        for file in files:
+            if detect_compression(file) is None and is_time_ordered(file):
+                sources.append(ReversedLog(file, parse_reversed_lines))
+            else:
+                print(f'[INFO] 끝에서부터 읽을 수 없는 로그라 정렬 후 병합합니다: {file}')
+                sources.append(external_sort(iter_valid_items(file_to_list(file)),
+                                             sort_buffer or DEFAULT_BUFFER_RECORDS))
+    except BaseException:
+        MergedLogs(sources).close()
+        raise
+    return MergedLogs(sources)
+
+
+# 병합한 로그를 위험 로그 필터와 출력 파일에 차례로 스트리밍
+def merge_and_save(patterns, output_format, sort_buffer=None, matcher=DANGER_MATCHER):
+    files = expand_log_files(patterns)
+    if not files:
+        return
+    try:
+        merged = merge_log_files(files, sort_buffer)
+    except FileNotFoundError as e:
+        print(f'[ERROR] 파일이 없습니다: {e.filename}')
+        return
+    print(f'[INFO] 로그 {len(files)}개 병합: {", ".join(files)}')
+    with merged:
+        save_danger_logs(danger_keyword_filtering(merged, matcher), DANGER_FILE)
+        if output_format == 'json':
+            try:
+                count = write_json_object(merged, JSON_FILE, to_epoch_us)
+                print(f"[INFO] 레코드 {count}건 JSON 파일로 저장됨: {JSON_FILE}")
+            except Exception as e:
+                print(f"[ERROR] JSON 저장 실패: {e}")
+        else:
+            record_file = BINARY_FILE if output_format == 'binary' else NDJSON_FILE
+            save_records(merged, record_file, output_format)
+
+
+# (epoch, item) 스트림을 시간 순으로 반환
+# 이미 시간 순이면 한 번 확인한 뒤 그대로 스트리밍하고, 아니면 외부 정렬 (정렬 결과는 stack 이 정리)
+def ascending_keyed(make_keyed_items, stack, sort_buffer=None):
+    previous = None
+    for epoch, item in make_keyed_items():
+        if previous is not None and epoch < previous:
+            break
+        previous = epoch
+    else:
+        return make_keyed_items()
+    runs = stack.enter_context(external_sort(make_keyed_items(), sort_buffer or DEFAULT_BUFFER_RECORDS,
+                                             reverse=False))
+    return runs.keyed()
 
 
-# 시간 역순으로 list 정렬
-def sort_list(parsed_list):
-    if parsed_list is None:
+# 미션 로그의 각 이벤트에 그 시각 직전의 센서 기록을 붙여 JSON Lines 로 저장 (as-of 조인)
+def join_sensor_readings(log_file, sensor_file, output_file, tolerance=None, sort_buffer=None):
+    try:
+        with contextlib.ExitStack() as stack:
+            events = ascending_keyed(lambda: iter_valid_items(iter_records(log_file)),
+                                     stack, sort_buffer)
+            readings = ascending_keyed(lambda: iter_sensor_readings(sensor_file, to_epoch_us),
+                                       stack, sort_buffer)
+            if tolerance is not None:
+                tolerance *= US_PER_SECOND
+            count, matched = write_joined(asof_join(events, readings, tolerance), output_file)
+    except FileNotFoundError as e:
+        print(f'[ERROR] 파일이 없습니다: {e.filename}')
+        return
+    print(f"[INFO] 이벤트 {count}건 중 {matched}건에 센서 기록을 붙여 저장함: {output_file}")
+
+
+# 로그를 열 단위 LogStore 로 변환 (event 컬럼과 원래 timestamp 문자열도 함께 보관)
+def file_to_store(file):
+    if file is None:
         print('[ERROR] 파일이 존재하지 않음')
         return
 
-    valid_items = []
+    return LogStore.from_records(
+        (epoch, timestamp, event, message)
+        for epoch, (timestamp, event, message) in iter_valid_items(iter_records(file))
+    )
+
 
+# 타임스탬프가 올바른 항목만 (epoch, item) 형태로 통과시킴 (타임스탬프는 한 번만 파싱)
+# epoch 는 마이크로초 단위 정수라 같은 초 안의 시각도 순서대로 정렬됨
+def iter_valid_items(parsed_list):
     for item in parsed_list:
         try:
-            datetime.fromisoformat(item[0])
-            valid_items.append(item)
+            epoch = to_epoch_us(item[0])
         except (ValueError, TypeError):
             print(f'잘못된 데이터 형식: {item}')
             continue
+        yield epoch, item
 
-    sorted_list = sorted(
-        valid_items,
-        key=lambda x: datetime.fromisoformat(x[0]),
-        reverse=True
-    )
+
+# 시간 역순으로 list 정렬
+# sort_buffer 를 지정하면 그 개수만큼씩 끊어 임시 파일로 외부 정렬하고
+# 다시 순회할 수 있는 병합 결과를 반환
+def sort_list(parsed_list, sort_buffer=None):
+    if parsed_list is None:
+        print('[ERROR] 파일이 존재하지 않음')
+        return
+
+    if isinstance(parsed_list, (LogStore, MappedRecords)):
+        return parsed_list.sort_desc()
+
+    if sort_buffer is not None:
+        return external_sort(iter_valid_items(parsed_list), sort_buffer)
+
+    keyed_items = list(iter_valid_items(parsed_list))
+    keyed_items.sort(key=itemgetter(0), reverse=True)
+    sorted_list = [item for _, item in keyed_items]
     return sorted_list
 
 
@@ -119,6 +383,71 @@ def save_dict_to_json(dict_data, file):
         print(f"[ERROR] JSON 저장 실패: {e}")
 
 
+# JSON 파일을 한 줄씩 읽어 메시지 trigram 색인과 항목별 바이트 위치를 만들어 JSON 옆에 저장
+def save_trigram_index(json_file, index_file):
+    try:
+        index = TrigramIndex.build(
+            ((offset, message) for offset, timestamp, message in iter_json_entries(json_file)),
+            file_fingerprint(json_file))
+        index.save(index_file)
+        print(f"[INFO] 검색 색인 저장됨: {index_file}")
+        return index
+    except Exception as e:
+        print(f"[ERROR] 검색 색인 저장 실패: {e}")
+        return
+
+
+# 저장된 색인이 현재 JSON 파일과 맞으면 불러오고, 아니면 새로 만듦
+def load_trigram_index(json_file, index_file):
+    try:
+        index = TrigramIndex.load(index_file)
+        if index.fingerprint == file_fingerprint(json_file):
+            return index
+        print('[INFO] 검색 색인이 JSON 파일과 맞지 않아 다시 만듭니다.')
+    except FileNotFoundError:
+        pass
+    except ValueError as e:
+        print(f'[ERROR] 검색 색인 읽기 실패: {e}')
+    return save_trigram_index(json_file, index_file)
+
+
+# 저장된 JSON 을 메모리에 올리지 않고 trigram 색인의 후보 항목만 찾아 읽어 검색
+# (3글자보다 짧은 검색어는 후보를 좁힐 수 없어 JSON 을 한 줄씩 훑음)
+class IndexedJson:
+    def __init__(self, json_file, index):
+        self.json_file = json_file
+        self.index = index
+
+    def search(self, query):
+        ids = self.index.candidates(query)
+        if ids is None:
+            entries = ((timestamp, message) for offset, timestamp, message
+                       in iter_json_entries(self.json_file))
+        else:
+            entries = read_json_entries(self.json_file, self.index.offsets(ids))
+        return [(ts, msg) for ts, msg in entries if query in msg]
+
+
+# 로그를 한 번 훑어 보고서용 집계만 계산
+def build_rollup(file, matcher=DANGER_MATCHER):
+    rollup = LogRollup(matcher)
+    for record in iter_records(file):
+        rollup.add(*record)
+    return rollup
+
+
+# 집계 결과를 JSON 으로 남기고, 그 집계로 사고 분석 보고서를 생성
+def save_report(rollup, rollup_file, markdown_file):
+    aggregates = rollup.to_dict()
+    try:
+        with open(rollup_file, 'w', encoding='utf-8') as f:
+            json.dump(aggregates, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] 집계 결과 저장됨: {rollup_file}")
+    except Exception as e:
+        print(f"[ERROR] 집계 결과 저장 실패: {e}")
+    save_markdown(render_report(aggregates), markdown_file)
+
+
 def save_markdown(report_content, file):
     try:
         with open(file, 'w', encoding='utf-8') as f:
@@ -128,28 +457,46 @@ def save_markdown(report_content, file):
         print(f"[ERROR] Markdown 파일 저장 실패: {e}")
 
 
-def danger_keyword_filtering(sorted_list):
-    filtered = []
-    for item in sorted_list:
-        message = item[1]
-        for keyword in DANGER_KEYWORDS:
-            if keyword in message:
-                filtered.append(item)
-                break
-    return filtered
+# 위험 키워드 매처 생성 (키워드 파일은 한 줄에 키워드 하나)
+def build_danger_matcher(keywords_file=None, ignore_case=False):
+    keywords = DANGER_KEYWORDS
+    if keywords_file is not None:
+        with open(keywords_file, 'r', encoding='utf-8') as f:
+            keywords = [line.strip() for line in f if line.strip()]
+    return KeywordMatcher(keywords, ignore_case=ignore_case)
 
 
+def danger_keyword_filtering(sorted_list, matcher=DANGER_MATCHER):
+    if isinstance(sorted_list, LogStore):
+        return sorted_list.filter(sorted_list.any_contains_mask(
+            matcher.keywords, ignore_case=matcher.ignore_case))
+    if isinstance(sorted_list, MappedRecords):
+        return sorted_list.filter_keywords(matcher.keywords, matcher.ignore_case)
+    if isinstance(sorted_list, BloomFilteredLog):
+        return sorted_list.filter_keywords(matcher)
+    return (item for item, keyword in danger_keyword_matches(sorted_list, matcher))
+
+
+# 위험 로그와 처음 일치한 키워드를 함께 반환
+def danger_keyword_matches(sorted_list, matcher=DANGER_MATCHER):
+    return matcher.match_items(sorted_list, 1)
+
+
+# 위험 로그가 없어도 파일을 비워 이전 실행의 위험 로그가 남지 않게 함
 def save_danger_logs(danger_list, file):
-    if not danger_list:
-        print("[INFO] 위험 로그가 없습니다.")
-        return
     try:
+        count = 0
         with open(file, 'w', encoding='utf-8') as f:
             for ts, msg in danger_list:
                 f.write(f"{ts}, {msg}\n")
-        print(f"[INFO] 위험 로그 저장됨: {file}")
+                count += 1
     except Exception as e:
         print(f"[ERROR] 위험 로그 저장 실패: {e}")
+        return
+    if count:
+        print(f"[INFO] 위험 로그 저장됨: {file}")
+    else:
+        print("[INFO] 위험 로그가 없습니다.")
 
 
 def search_logs(dict_data):
@@ -160,106 +507,568 @@ def search_logs(dict_data):
     if not query:
         print('검색 문자열이 입력되지 않았습니다.')
         return
-    results = {ts: msg for ts, msg in dict_data.items() if query in msg}
+    if isinstance(dict_data, LogStore):
+        results = list(dict_data.filter(dict_data.contains_mask(query)))
+    elif isinstance(dict_data, (MappedRecords, BloomFilteredLog, IndexedJson)):
+        results = list(dict_data.search(query))
+    elif isinstance(dict_data, dict):
+        results = [(ts, msg) for ts, msg in dict_data.items() if query in msg]
+    else:
+        results = [(ts, msg) for ts, msg in dict_data if query in msg]
     if results:
         print(f'\n---------------검색 결과 ({query})---------------')
-        for ts, msg in results.items():
+        for ts, msg in results:
             print(f"{ts}, {msg}")
     else:
         print(f"'{query}'를 포함한 로그가 없습니다.")
 
 
-def main():
-    log_file = read_file(LOG_FILE)
-    if log_file is None:
-        return
+# 로그 옆에 두는 블록 Bloom 필터 색인 파일 경로
+def bloom_file_for(log_file):
+    return f'{log_file}.bloom'
 
-    parsed_list = file_to_list(log_file)
-    if parsed_list is None:
-        return
-    print('---------------print parsed list---------------')
-    pprint.pprint(parsed_list, width=79)
 
-    sorted_list = sort_list(parsed_list)
-    if sorted_list is None:
-        return
-    print('---------------print sorted list---------------')
-    pprint.pprint(sorted_list, width=79)
+# 저장된 Bloom 색인이 현재 로그와 맞으면 불러오고, 아니면 새로 만들어 저장
+def load_bloom_index(log_file):
+    bloom_file = bloom_file_for(log_file)
+    fingerprint = file_fingerprint(log_file)
+    try:
+        index = BlockBloomIndex.load(bloom_file)
+        if index.fingerprint == fingerprint:
+            return index
+        print('[INFO] Bloom 색인이 로그 파일과 맞지 않아 다시 만듭니다.')
+    except FileNotFoundError:
+        pass
+    except ValueError as e:
+        print(f'[ERROR] Bloom 색인 읽기 실패: {e}')
+    index = BlockBloomIndex.build(log_file, fingerprint=fingerprint)
+    try:
+        index.save(bloom_file)
+        print(f"[INFO] Bloom 색인 저장됨: {bloom_file}")
+    except Exception as e:
+        print(f"[ERROR] Bloom 색인 저장 실패: {e}")
+    return index
 
-    danger_list = danger_keyword_filtering(sorted_list)
-    save_danger_logs(danger_list, DANGER_FILE)
 
-    dict_data = list_to_dict(sorted_list)
-    if dict_data is None:
-        return
-    print('---------------print dict---------------')
-    pprint.pprint(dict_data, width=79)
+# Bloom 색인으로 일치할 수 있는 블록만 읽어 위험 로그/검색 결과를 찾는 로그
+# 결과는 찾은 레코드만 정렬하므로 sort_list(file_to_list(file)) 에서 거른 것과 같은 순서
+class BloomFilteredLog:
+    def __init__(self, file, index):
+        self.file = file
+        self.index = index
+
+    def _records(self, patterns):
+        blocks = self.index.candidate_blocks(patterns)
+        print(f'[INFO] 블록 {len(self.index)}개 중 {len(blocks)}개를 읽습니다.')
+        return parse_log_lines(clean_log_lines(iter_block_lines(self.file, blocks)))
+
+    def filter_keywords(self, matcher=DANGER_MATCHER):
+        return sort_list([timestamp, message]
+                         for timestamp, event, message in self._records(matcher.keywords)
+                         if matcher.search(message) is not None)
+
+    def search(self, query):
+        return sort_list([timestamp, message]
+                         for timestamp, event, message in self._records([query])
+                         if query in message)
 
-    save_dict_to_json(dict_data, JSON_FILE)
 
-    search_logs(dict_data)
+# 검색식용 LogStore 를 시간 순으로 만들어 캐시 (로그 파일이 바뀌면 다시 만듦)
+def load_query_store(log_file, store_file):
+    fingerprint = {**file_fingerprint(log_file), 'log': os.path.abspath(log_file)}
+    try:
+        store, meta = LogStore.load(store_file)
+        if meta == fingerprint:
+            return store
+    except (OSError, ValueError, KeyError):
+        pass
+    store = file_to_store(log_file).sort_asc()
+    try:
+        store.save(store_file, fingerprint)
+        print(f"[INFO] 검색용 색인 저장됨: {store_file}")
+    except Exception as e:
+        print(f"[ERROR] 검색용 색인 저장 실패: {e}")
+    return store
 
-    report_content = """
-# 사고 원인 분석 보고서
 
+# 검색식을 차례로 실행해 결과를 시간 역순으로 출력 (로그는 한 번만 로드)
+# 같은 시각의 레코드는 다른 출력처럼 로그에 적힌 순서 유지
+def run_queries(store, queries):
+    for query in queries:
+        try:
+            indices = run_query(store, query)
+        except QuerySyntaxError as e:
+            print(f'[ERROR] 검색식 오류 ({query}): {e}')
+            continue
+        print(f'---------------검색 결과 ({query}): {len(indices)}건---------------')
+        results = store.take(indices[np.argsort(-store.epochs[indices], kind='stable')])
+        for i, timestamp in enumerate(results.timestamps()):
+            print(f'{timestamp},{results.level(i)},{results.message(i)}')
 
-## 1. 개요
 
-2025년 8월 27일 misson computer에서 발생한 사고의 원인을 분석하기 위해 작성된 보고서입니다.
+# 정렬된 레코드를 들어오는 순서대로 JSON Lines / 바이너리 형식으로 저장 (중복 시각도 보존)
+def save_records(sorted_list, file, output_format):
+    writer = write_binary_records if output_format == 'binary' else write_ndjson
+    try:
+        count = writer(sorted_list, file, to_epoch)
+        print(f"\n[INFO] 레코드 {count}건 저장됨: {file}")
+    except Exception as e:
+        print(f"[ERROR] 레코드 저장 실패: {e}")
 
----
 
-## 2. 로그 요약
+# JSON Lines 출력에서 해당 시각의 레코드를 모두 찾아 출력
+def lookup_timestamp(timestamp, file=NDJSON_FILE):
+    try:
+        records = TimestampMultimap(file, to_epoch_us).get(timestamp)
+    except FileNotFoundError:
+        print(f'[ERROR] JSON Lines 파일이 없습니다: {file}')
+        return
+    except ValueError:
+        print(f'잘못된 데이터 형식: {timestamp}')
+        return
+    if not records:
+        print(f"'{timestamp}' 시각의 로그가 없습니다.")
+    for record in records:
+        print(f"{record['timestamp']}, {record['message']}")
+    return records
 
-- 발사 준비 단계 (10:00:00 ~ 10:27:00)
-- 이륙 및 상승 단계 (10:30:00 ~ 10:48:00)
-- 궤도 진입 및 임무 수행 (10:50:00 ~ 11:05:00)
-- 로켓 귀환 및 착륙 단계 (11:10:00 ~ 11:28:00)
-- 임무 완료 및 사고 발생 (11:30:00 ~ 12:00:00)
 
----
+# 로그 파일 식별 정보 (inode/device 가 바뀌거나 크기가 줄면 교체된 것으로 판단)
+def log_file_identity(file):
+    stat = os.stat(file)
+    return {'inode': stat.st_ino, 'device': stat.st_dev, 'size': stat.st_size}
 
-## 3. 주요 이상 징후
 
-1. **Oxygen tank unstable**  
-   - **시간:** 2023-08-27 11:35:00  
-   - **로그:** `“Oxygen tank unstable.”`  
-   - **설명:** 착륙 후 로켓의 산소 탱크에서 문제 발생
+def load_follow_state(file):
+    try:
+        with open(file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return
 
-2. **Oxygen tank explosion**  
-   - **시간:** 2023-08-27 11:40:00  
-   - **로그:** `“Oxygen tank explosion.”`  
-   - **설명:** 불안정 상태 5분 후 탱크 내부 압력 급증 또는 재료 결함으로 폭발 발생.
 
-3. **Mission control systems powered down**  
-   - **시간:** 2023-08-27 12:00:00  
-   - **로그:** `“Center and mission control systems powered down.”`  
-   - **설명:** 사고 수습 및 안전 확보를 위해 미션 제어 시스템 셧다운.
+def save_follow_state(state, file):
+    tmp_file = f'{file}.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, file)
+
+
+# offset 이후 마지막 완전한 줄이 끝나는 위치 (쓰는 중인 마지막 줄은 다음에 처리)
+# 파일 끝에서부터 블록 단위로 줄바꿈을 찾으므로 추가된 내용 전체를 읽지 않음
+def complete_lines_end(file, offset):
+    with open(file, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > offset:
+            start = max(offset, end - READ_BLOCK)
+            f.seek(start)
+            cut = f.read(end - start).rfind(b'\n')
+            if cut != -1:
+                return start + cut + 1
+            end = start
+    return offset
+
+
+# [start, end) 구간의 줄을 한 줄씩 읽음 (start, end 는 줄의 경계)
+def iter_lines_between(file, start, end):
+    with open(file, 'rb') as f:
+        f.seek(start)
+        while start < end:
+            raw = f.readline()
+            if not raw:
+                break
+            start += len(raw)
+            yield raw.decode('utf-8')
+
+
+# 로그 [start, end) 구간을 시간 순 (epoch, [timestamp, message]) 로 외부 정렬
+# (같은 시각은 로그에 적힌 순서 유지, 메모리는 sort_buffer 개로 제한)
+def sort_log_range(file, start, end, sort_buffer=None):
+    keyed_items = iter_valid_items(
+        [timestamp, message] for timestamp, event, message
+        in parse_log_lines(clean_log_lines(iter_lines_between(file, start, end))))
+    return external_sort(keyed_items, sort_buffer or DEFAULT_BUFFER_RECORDS, reverse=False)
+
+
+# follow 출력 (JSON Lines) 한 줄을 (epoch, [timestamp, message]) 로 변환
+def parse_follow_lines(lines):
+    for line in lines:
+        if line.strip():
+            record = json.loads(line)
+            yield to_epoch_us(record['timestamp']), [record['timestamp'], record['message']]
+
+
+# 시간 순 (epoch, [timestamp, message]) 를 records_file 에 기록하고 그중 위험 로그는 danger_file 에도 기록
+# 두 파일을 한 번의 순회로 함께 쓰므로 입력(외부 정렬 결과 등)은 한 번만 스트리밍으로 읽음
+# -> (레코드 수, 위험 로그 수, 마지막 epoch)
+def write_follow_outputs(keyed_items, matcher, records_file, danger_file, mode='a'):
+    count = danger_count = 0
+    last_epoch = None
+    with open(records_file, mode, encoding='utf-8') as records, \
+            open(danger_file, mode, encoding='utf-8') as danger:
+        for epoch, (timestamp, message) in keyed_items:
+            line = ndjson_line(timestamp, message, epoch // US_PER_SECOND)
+            records.write(line)
+            count += 1
+            if matcher.search(message) is not None:
+                danger.write(line)
+                danger_count += 1
+            last_epoch = epoch
+    return count, danger_count, last_epoch
+
+
+def follow_output_sizes():
+    return {'records_size': os.path.getsize(FOLLOW_RECORDS_FILE),
+            'danger_size': os.path.getsize(FOLLOW_DANGER_FILE)}
+
+
+# 이전 follow 상태에서 이어서 처리할 수 있는지
+# (상태나 출력 파일이 없거나, 끝부분 병합 도중 중단됐거나, 출력이 상태보다 짧으면 다시 만들어야 함)
+def can_resume_follow(state):
+    if state is None or 'max_epoch_us' not in state or state.get('merging'):
+        return False
+    try:
+        sizes = follow_output_sizes()
+    except FileNotFoundError:
+        return False
+    return sizes['records_size'] >= state['records_size'] \
+        and sizes['danger_size'] >= state['danger_size']
+
+
+# 로그 전체를 다시 처리해 follow 출력을 새로 만들고 follow 상태 반환
+# (쓰는 중인 마지막 줄은 제외하고 마지막 완전한 줄까지만 처리)
+def rebuild_outputs(log_file, matcher, sort_buffer=None):
+    identity = log_file_identity(log_file)
+    offset = complete_lines_end(log_file, 0)
+    with sort_log_range(log_file, 0, offset, sort_buffer) as runs:
+        count, danger_count, last_epoch = write_follow_outputs(
+            runs.keyed(), matcher, FOLLOW_RECORDS_FILE, FOLLOW_DANGER_FILE, mode='w')
+    print(f'[INFO] 로그 {count}건 처리 (위험 로그 {danger_count}건)')
+    return {**identity, 'offset': offset, 'max_epoch_us': last_epoch, **follow_output_sizes()}
+
+
+# 기존 follow 출력 중 first_epoch 보다 늦은 끝부분만 새 레코드와 병합해 다시 씀
+# 끝부분과 새 레코드를 임시 파일에 병합한 뒤 두 출력 파일을 끝부분 시작 위치에서 자르고 덧붙임
+# (같은 시각이면 기존 레코드가 먼저 -> 로그에 적힌 순서 유지)
+def merge_follow_tail(new_keyed_items, first_epoch, matcher):
+    records_cut = ndjson_upper_bound(FOLLOW_RECORDS_FILE, first_epoch, to_epoch_us)
+    danger_cut = ndjson_upper_bound(FOLLOW_DANGER_FILE, first_epoch, to_epoch_us)
+    tail = parse_follow_lines(iter_lines_between(
+        FOLLOW_RECORDS_FILE, records_cut, os.path.getsize(FOLLOW_RECORDS_FILE)))
+    with tempfile.TemporaryDirectory(prefix='mission_follow_') as tmp_dir:
+        records_tmp = os.path.join(tmp_dir, 'records.jsonl')
+        danger_tmp = os.path.join(tmp_dir, 'danger.jsonl')
+        result = write_follow_outputs(heapq.merge(tail, new_keyed_items, key=itemgetter(0)),
+                                      matcher, records_tmp, danger_tmp, mode='w')
+        for file, cut, tmp_file in ((FOLLOW_RECORDS_FILE, records_cut, records_tmp),
+                                    (FOLLOW_DANGER_FILE, danger_cut, danger_tmp)):
+            os.truncate(file, cut)
+            with open(tmp_file, 'rb') as src, open(file, 'ab') as dst:
+                shutil.copyfileobj(src, dst)
+    return result
+
+
+# 마지막 처리 위치 이후에 추가된 줄만 정렬해 follow 출력에 반영
+# 새 레코드가 모두 기존 최신 시각 이후면 끝에 덧붙이기만 하고,
+# 과거 시각 레코드가 섞여 있으면 그 시각 이후의 출력 끝부분만 다시 병합함
+def process_appended(log_file, matcher=DANGER_MATCHER, state_file=STATE_FILE, sort_buffer=None):
+    state = load_follow_state(state_file)
+    if not can_resume_follow(state):
+        print('[INFO] 이어서 처리할 이전 상태가 없어 전체 로그를 처리합니다.')
+        state = rebuild_outputs(log_file, matcher, sort_buffer)
+        save_follow_state(state, state_file)
+        return state
+
+    identity = log_file_identity(log_file)
+    offset = state['offset']
+    if (identity['inode'], identity['device']) != (state['inode'], state['device']) \
+            or identity['size'] < offset:
+        print('[INFO] 로그 파일이 교체되어 처음부터 이어서 읽습니다.')
+        offset = 0
+
+    # 지난번에 상태를 저장하기 전에 중단됐다면 그때 덧붙인 내용을 버림
+    os.truncate(FOLLOW_RECORDS_FILE, state['records_size'])
+    os.truncate(FOLLOW_DANGER_FILE, state['danger_size'])
+
+    end = complete_lines_end(log_file, offset)
+    state.update(identity, offset=end)
+    if end > offset:
+        with sort_log_range(log_file, offset, end, sort_buffer) as runs:
+            keyed_items = runs.keyed()
+            first = next(keyed_items, None)
+            keyed_items.close()
+            late = first is not None and state['max_epoch_us'] is not None \
+                and first[0] < state['max_epoch_us']
+            if late:
+                print('[INFO] 기존 로그보다 이른 시각의 레코드가 있어 그 시각 이후의 출력만 다시 병합합니다.')
+                # 출력 파일을 자르는 도중 중단되면 다음 실행에서 전체를 다시 만들도록 표시
+                save_follow_state({**state, 'merging': True}, state_file)
+                count, danger_count, last_epoch = merge_follow_tail(runs.keyed(), first[0], matcher)
+                print(f'[INFO] 기존 출력 끝부분과 새 로그 {count}건 병합 (위험 로그 {danger_count}건)')
+                state.update(max_epoch_us=last_epoch)
+            elif first is not None:
+                count, danger_count, last_epoch = write_follow_outputs(
+                    runs.keyed(), matcher, FOLLOW_RECORDS_FILE, FOLLOW_DANGER_FILE)
+                print(f'[INFO] 새 로그 {count}건 반영 (위험 로그 {danger_count}건)')
+                state.update(max_epoch_us=last_epoch)
+
+    state.update(follow_output_sizes())
+    save_follow_state(state, state_file)
+    return state
+
+
+# follow 출력을 끝에서부터 읽어 시간 역순 JSON / 위험 로그 파일로 내보냄
+# (같은 시각의 레코드는 로그에 적힌 순서 유지 -> 전체를 처리한 결과와 같은 파일)
+def export_follow_outputs():
+    if not os.path.exists(FOLLOW_RECORDS_FILE) or not os.path.exists(FOLLOW_DANGER_FILE):
+        print('[ERROR] follow 출력이 없습니다. 먼저 --incremental 또는 --follow 를 실행하세요.')
+        return
+    save_danger_logs(ReversedLog(FOLLOW_DANGER_FILE, parse_follow_lines), DANGER_FILE)
+    try:
+        count = write_json_object(ReversedLog(FOLLOW_RECORDS_FILE, parse_follow_lines),
+                                  JSON_FILE, to_epoch_us)
+        print(f"[INFO] 레코드 {count}건 JSON 파일로 저장됨: {JSON_FILE}")
+    except Exception as e:
+        print(f"[ERROR] JSON 저장 실패: {e}")
 
----
 
-## 4. 사고 경위 추론
+# 로그 파일을 주기적으로 확인하며 추가된 줄만 계속 반영
+def follow_log(log_file, interval, matcher=DANGER_MATCHER, sort_buffer=None):
+    print(f'[INFO] {log_file} 추적 시작 ({interval}초 간격, Ctrl+C 로 종료)')
+    try:
+        while True:
+            process_appended(log_file, matcher, sort_buffer=sort_buffer)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print('[INFO] 로그 추적을 종료합니다.')
+
+
+# 요청한 출력에 필요한 단계만 실행하는 lazy 단계 그래프
+# 각 단계는 처음 요청될 때 한 번만 계산되고, 필요한 앞 단계를 직접 요청함
+#   sorted (또는 --bloom 이면 bloom) -> danger
+#   sorted -> dict (정렬 결과가 list 일 때만) -> json -> index -> search (--bloom 이면 bloom -> search)
+#   rollup -> report (sorted 를 계산했다면 같은 파싱 패스에서 집계한 결과를 재사용)
+class LogPipeline:
+    def __init__(self, log_file, args, matcher=DANGER_MATCHER):
+        self.log_file = log_file
+        self.args = args
+        self.matcher = matcher
+        self.preview = None if args.preview < 0 else args.preview
+        self._results = {}
+        self._tracked_rollup = None
+
+    def get(self, stage):
+        if stage not in self._results:
+            self._results[stage] = getattr(self, f'_{stage}')()
+        return self._results[stage]
+
+    def run(self, outputs):
+        for output in OUTPUTS:
+            if output in outputs:
+                self.get(output)
+
+    def _sorted(self):
+        args = self.args
+        print_preview('print parsed list', file_to_list(self.log_file), self.preview)
+        if args.workers is not None:
+            sorted_list = parse_sort_parallel(self.log_file, args.workers)
+        else:
+            if args.columnar:
+                parsed_list = file_to_store(self.log_file)
+            elif args.mmap:
+                parsed_list = MappedLog(self.log_file).records()
+            elif 'report' in args.outputs:
+                # 보고서도 요청했다면 파싱하는 같은 패스에서 보고서용 집계도 함께 계산
+                self._tracked_rollup = LogRollup(self.matcher)
+                parsed_list = ([timestamp, message] for timestamp, event, message
+                               in self._tracked_rollup.track(iter_records(self.log_file)))
+            else:
+                parsed_list = file_to_list(self.log_file)
+            sorted_list = sort_list(parsed_list, args.sort_buffer)
+        print_preview('print sorted list', sorted_list, self.preview)
+        return sorted_list
+
+    def _bloom(self):
+        return BloomFilteredLog(self.log_file, load_bloom_index(self.log_file))
+
+    def _danger(self):
+        sorted_list = self.get('bloom' if self.args.bloom else 'sorted')
+        if sorted_list is not None:
+            save_danger_logs(danger_keyword_filtering(sorted_list, self.matcher), DANGER_FILE)
+
+    def _dict(self):
+        dict_data = list_to_dict(self.get('sorted'))
+        if dict_data is not None:
+            print_preview('print dict', dict_data.items(), self.preview)
+        return dict_data
+
+    # --output-format 에 따라 JSON 또는 JSON Lines / 바이너리 레코드 파일 저장
+    # 정렬 결과가 list 가 아니면 (외부 정렬, LogStore 등) dict 를 만들지 않고 같은 JSON 을 스트리밍으로 기록
+    def _json(self):
+        sorted_list = self.get('sorted')
+        if sorted_list is None:
+            return False
+        if self.args.output_format != 'json':
+            record_file = BINARY_FILE if self.args.output_format == 'binary' else NDJSON_FILE
+            save_records(sorted_list, record_file, self.args.output_format)
+            return False
+        if not isinstance(sorted_list, list):
+            try:
+                count = write_json_object(sorted_list, JSON_FILE, to_epoch_us)
+            except Exception as e:
+                print(f"[ERROR] JSON 저장 실패: {e}")
+                return False
+            print(f"\n[INFO] 레코드 {count}건 JSON 파일로 저장됨: {JSON_FILE}")
+            return True
+        dict_data = self.get('dict')
+        if dict_data is None:
+            return False
+        save_dict_to_json(dict_data, JSON_FILE)
+        return True
+
+    def _index(self):
+        if not self.get('json'):
+            return
+        return save_trigram_index(JSON_FILE, TRIGRAM_FILE)
+
+    def _search(self):
+        args = self.args
+        if args.bloom:
+            search_logs(self.get('bloom'))
+        elif args.columnar or args.mmap or args.output_format != 'json':
+            search_logs(self.get('sorted'))
+        elif 'json' in self._results and self.get('index') is not None:
+            # 이번 실행에서 JSON 을 저장했다면 그 JSON 에 맞는 색인으로 후보만 읽어 검색
+            search_logs(IndexedJson(JSON_FILE, self.get('index')))
+        else:
+            search_logs(self.get('dict'))
+
+    def _rollup(self):
+        if self._tracked_rollup is not None:
+            return self._tracked_rollup
+        return build_rollup(self.log_file, self.matcher)
+
+    def _report(self):
+        save_report(self.get('rollup'), ROLLUP_FILE, MARKDOWN_FILE)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='mission computer 로그 분석')
+    parser.add_argument('--log', default=LOG_FILE,
+                        help='분석할 로그 파일 (gzip/bz2/xz 압축 파일도 가능)')
+    parser.add_argument('--merge', nargs='+', metavar='LOG', default=None,
+                        help='여러 로그 파일(glob 패턴 가능)을 시간 순으로 병합해 위험 로그와 출력 파일 생성')
+    parser.add_argument('--outputs', nargs='+', choices=OUTPUTS, default=list(OUTPUTS),
+                        help='만들 출력 (필요한 단계만 실행), 기본값은 모두')
+    parser.add_argument('--preview', type=int, metavar='N', default=DEFAULT_PREVIEW,
+                        help=f'단계마다 콘솔에 출력할 최대 항목 수 (0 이면 출력 안 함, 음수면 모두, 기본값 {DEFAULT_PREVIEW})')
+    parser.add_argument('--join-sensors', nargs='?', const=SENSOR_LOG, default=None, metavar='SENSOR_LOG',
+                        help='각 로그 이벤트에 그 시각 직전의 센서 기록(기본값은 03/mars_sensor_log.txt)을 붙여 저장')
+    parser.add_argument('--join-tolerance', type=float, metavar='SECONDS', default=None,
+                        help='--join-sensors 에서 이보다 오래된 센서 기록은 붙이지 않음')
+    parser.add_argument('--sort-buffer', type=int, default=None,
+                        help='외부 정렬 시 메모리에 올릴 최대 레코드 수 (지정하지 않으면 메모리 정렬)')
+    parser.add_argument('--columnar', action='store_true',
+                        help='열 단위 LogStore 로 파싱해 정렬/필터/검색 수행')
+    parser.add_argument('--keywords-file', default=None,
+                        help='위험 키워드 목록 파일 (한 줄에 하나, 기본값은 DANGER_KEYWORDS)')
+    parser.add_argument('--ignore-case', action='store_true',
+                        help='위험 키워드를 대소문자 구분 없이 검색')
+    parser.add_argument('--search-only', action='store_true',
+                        help='로그를 다시 분석하지 않고 저장된 JSON 과 검색 색인으로 바로 검색')
+    parser.add_argument('--mmap', action='store_true',
+                        help='로그를 메모리 매핑해 바이트 단위로 정렬/필터/검색 (출력할 줄만 디코딩)')
+    parser.add_argument('--bloom', action='store_true',
+                        help='블록별 Bloom 필터 색인(로그 옆 .bloom 파일)으로 일치할 수 없는 블록을 건너뛰고 위험 로그/검색 수행')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='지정한 프로세스 수로 로그를 나눠 병렬 파싱/정렬')
+    parser.add_argument('--output-format', choices=('json', 'ndjson', 'binary'), default='json',
+                        help='정렬된 로그 저장 형식 (ndjson/binary 는 레코드를 스트리밍으로 기록)')
+    parser.add_argument('--lookup', metavar='TIMESTAMP', default=None,
+                        help='저장된 JSON Lines 에서 해당 시각의 로그를 모두 조회')
+    parser.add_argument('--report-only', action='store_true',
+                        help='로그를 한 번만 훑어 집계와 분석 보고서만 생성')
+    parser.add_argument('--decompress-workers', type=int, default=None,
+                        help='여러 member 로 된 gzip 로그를 지정한 프로세스 수로 병렬 해제')
+    parser.add_argument('--query', action='append', default=[],
+                        help='검색식 실행 (여러 번 지정 가능), 예: level:WARNING after:2023-08-27T11:00 before:12:00 "tank" AND NOT "nominal"')
+    parser.add_argument('--query-file', default=None,
+                        help='한 줄에 검색식 하나씩 적힌 파일의 검색식을 모두 실행')
+    parser.add_argument('--incremental', action='store_true',
+                        help='마지막 처리 위치 이후에 추가된 로그만 반영하고 종료')
+    parser.add_argument('--follow', type=float, metavar='SECONDS', default=None,
+                        help='지정한 간격으로 로그 파일을 추적하며 추가된 로그만 계속 반영')
+    parser.add_argument('--follow-export', action='store_true',
+                        help='--incremental/--follow 로 누적한 출력을 시간 역순 JSON 과 위험 로그 파일로 내보냄')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    global DECOMPRESS_WORKERS
+    args = parse_args(argv)
+    DECOMPRESS_WORKERS = args.decompress_workers
+
+    # 바이트 위치를 직접 다루는 모드는 압축 로그를 지원하지 않음
+    byte_offset_modes = args.workers is not None or args.mmap or args.bloom \
+        or args.incremental or args.follow is not None
+    if byte_offset_modes and os.path.exists(args.log) and detect_compression(args.log):
+        print('[ERROR] --workers/--mmap/--bloom/--incremental/--follow 는 압축되지 않은 로그에서만 사용할 수 있습니다.')
+        return
 
-1. **정상 미션 완료**  
-   - 11:05:00에 위성 배치 성공 후 재진입 및 착륙까지 모든 시스템이 정상 작동.  
+    if args.search_only:
+        if not os.path.exists(JSON_FILE):
+            print(f'[ERROR] JSON 파일이 없습니다: {JSON_FILE}')
+            return
+        index = load_trigram_index(JSON_FILE, TRIGRAM_FILE)
+        if index is not None:
+            search_logs(IndexedJson(JSON_FILE, index))
+        return
 
-2. **착륙 직후 탱크 이상 징후 발생**  
-   - 11:35:00 착륙 확인(11:28)을 기점으로, 착륙지 환경 변화(온도·압력 급변)나 탱크 구조적 결함으로 인해 산소 탱크 내부 압력 불안정이 감지됨.
+    if args.lookup is not None:
+        lookup_timestamp(args.lookup)
+        return
 
-3. **탱크 내부 압력 급증 및 폭발**  
-   - 불안정 상태 감지 5분 후(11:40), 내부 압력 제어 실패로 탱크가 폭발. 이로 인해 주변 구조물 및 제어 시스템에 2차 피해가 발생했을 가능성 높음.
+    if args.merge:
+        matcher = build_danger_matcher(args.keywords_file, args.ignore_case)
+        merge_and_save(args.merge, args.output_format, args.sort_buffer, matcher)
+        return
 
-4. **시스템 셧다운**  
-   - 사고 대응 프로토콜에 따라 12:00에 미션 제어 시스템을 안전하게 종료하여 추가 피해를 방지.
+    if args.join_sensors is not None:
+        join_sensor_readings(args.log, args.join_sensors, SENSOR_JOIN_FILE,
+                             args.join_tolerance, args.sort_buffer)
+        return
 
+    if args.query or args.query_file:
+        queries = list(args.query)
+        if args.query_file:
+            with open(args.query_file, 'r', encoding='utf-8') as f:
+                queries += [line.strip() for line in f if line.strip()]
+        run_queries(load_query_store(args.log, STORE_FILE), queries)
+        return
+
+    if args.report_only:
+        matcher = build_danger_matcher(args.keywords_file, args.ignore_case)
+        save_report(build_rollup(args.log, matcher), ROLLUP_FILE, MARKDOWN_FILE)
+        return
+
+    if args.follow_export:
+        export_follow_outputs()
+        return
 
----
+    if args.incremental or args.follow is not None:
+        matcher = build_danger_matcher(args.keywords_file, args.ignore_case)
+        if args.follow is not None:
+            follow_log(args.log, args.follow, matcher, args.sort_buffer)
+        else:
+            process_appended(args.log, matcher, sort_buffer=args.sort_buffer)
+        return
 
-## 5. 결론
+    log_file = preview_file(args.log, None if args.preview < 0 else args.preview)
+    if log_file is None:
+        return
 
-이 로그는 표면적으로는 완벽하게 성공한 임무였으나, 임무 종료 직후 발생한 하드웨어의 치명적인 고장으로 끝난 사례를 기록하고 있습니다. 이는 우주 임무의 복잡성과 위험성을 명확히 보여주며, 임무의 성공 여부는 발사부터 회수 후 안정화 단계까지 모든 과정이 안전하게 종료되어야만 판단할 수 있다는 교훈을 줍니다. 
-    """
-    save_markdown(report_content, MARKDOWN_FILE)
+    matcher = build_danger_matcher(args.keywords_file, args.ignore_case)
+    LogPipeline(log_file, args, matcher).run(args.outputs)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,129 @@
+import logging
+import mmap
+from array import array
+
+import numpy as np
+
+from log_time import bytes_to_epoch_us
+
+HEADER_PREFIX = b'timestamp,'
+# int64 배열 참조를 순회할 때 한 번에 Python 정수로 바꾸는 행 수
+REF_CHUNK = 65536
+
+
+# 로그 파일을 메모리 매핑해 줄/필드 위치(바이트 오프셋)만 다루는 리더
+class MappedLog:
+    def __init__(self, file):
+        self.file = file
+        self._f = open(file, 'rb')
+        try:
+            self.data = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 빈 파일은 매핑할 수 없음
+            self.data = b''
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # 빈 줄과 헤더를 제외한 (줄 시작, 줄 끝) 오프셋
+    # [start, stop) 구간만 읽을 수 있음 (start 는 줄의 시작 위치, 헤더는 파일 맨 앞에서만 확인)
+    def iter_lines(self, start=0, stop=None):
+        data = self.data
+        size = len(data) if stop is None else min(stop, len(data))
+        header_checked = start > 0
+        while start < size:
+            end = data.find(b'\n', start, size)
+            if end == -1:
+                end = size
+            next_start = end + 1
+            if end > start and data[end - 1:end] == b'\r':
+                end -= 1
+            if data[start:end].strip():
+                if not header_checked:
+                    header_checked = True
+                    if data[start:start + len(HEADER_PREFIX)].lower() == HEADER_PREFIX:
+                        start = next_start
+                        continue
+                yield start, end
+            start = next_start
+
+    # 올바른 줄마다 (epoch(마이크로초), 줄 시작, timestamp 끝, message 시작, 줄 끝) 참조를 만듦
+    # 줄마다 tuple 을 만들지 않고 array('q') 에 이어 붙인 뒤 int64 (N, 5) 배열로 봄
+    def records(self, start=0, stop=None):
+        data = self.data
+        refs = array('q')
+        for start, end in self.iter_lines(start, stop):
+            first = data.find(b',', start, end)
+            second = data.find(b',', first + 1, end) if first != -1 else -1
+            if second == -1:
+                logging.warning('[ERROR] 파일 형식 불일치 (3분할 실패)')
+                continue
+            try:
+                epoch = bytes_to_epoch_us(data[start:first])
+            except (ValueError, UnicodeDecodeError):
+                print(f'잘못된 데이터 형식: {self.decode(start, end)}')
+                continue
+            refs.extend((epoch, start, first, second + 1, end))
+        return MappedRecords(self, np.frombuffer(refs, dtype=np.int64).reshape(-1, 5))
+
+    def decode(self, start, end):
+        return self.data[start:end].decode('utf-8').strip()
+
+
+# MappedLog 의 레코드 참조 목록
+# 정렬/필터/검색은 원본 바이트에서 수행하고, 순회할 때만 [timestamp, message] 로 디코딩
+# refs 는 int64 (N, 5) 배열 (순회할 때 REF_CHUNK 행씩 Python 정수로 변환)
+class MappedRecords:
+    def __init__(self, mapped, refs):
+        self.mapped = mapped
+        self.refs = refs
+
+    def __len__(self):
+        return len(self.refs)
+
+    def __repr__(self):
+        return f'MappedRecords(file={self.mapped.file!r}, records={len(self)})'
+
+    def _iter_refs(self):
+        for i in range(0, len(self.refs), REF_CHUNK):
+            yield from self.refs[i:i + REF_CHUNK].tolist()
+
+    def __iter__(self):
+        decode = self.mapped.decode
+        for _, start, ts_end, msg_start, end in self._iter_refs():
+            yield [decode(start, ts_end), decode(msg_start, end)]
+
+    # 시간 역순 정렬 (같은 시간은 원래 순서 유지)
+    def sort_desc(self):
+        return MappedRecords(self.mapped, self.refs[np.argsort(-self.refs[:, 0], kind='stable')])
+
+    # message 구간에 키워드가 하나라도 있는 레코드만 남김
+    # 대소문자 구분 검색은 mmap.find 로 복사 없이 수행, ignore_case 는 ASCII 기준
+    def filter_keywords(self, keywords, ignore_case=False):
+        needles = [keyword.encode('utf-8') for keyword in keywords]
+        data = self.mapped.data
+        # 남길 행 번호만 모아 참조 배열에서 한 번에 골라냄
+        kept = array('q')
+        if ignore_case:
+            needles = [needle.lower() for needle in needles]
+            for index, ref in enumerate(self._iter_refs()):
+                message = data[ref[3]:ref[4]].lower()
+                if any(needle in message for needle in needles):
+                    kept.append(index)
+        else:
+            for index, ref in enumerate(self._iter_refs()):
+                msg_start, end = ref[3], ref[4]
+                if any(data.find(needle, msg_start, end) != -1 for needle in needles):
+                    kept.append(index)
+        return MappedRecords(self.mapped, self.refs[np.frombuffer(kept, dtype=np.int64)])
+
+    def search(self, query):
+        return self.filter_keywords([query])
@@ -0,0 +1,183 @@
+import json
+import os
+import struct
+
+BINARY_MAGIC = b'MLOGREC1\n'
+# epoch(int64), timestamp 길이(uint16), message 길이(uint32)
+BINARY_HEADER = struct.Struct('<qHI')
+
+
+# 레코드 하나를 JSON Lines 한 줄로 변환
+def ndjson_line(timestamp, message, epoch):
+    record = {'timestamp': timestamp, 'epoch': epoch, 'message': message}
+    return json.dumps(record, ensure_ascii=False) + '\n'
+
+
+# 레코드가 들어오는 대로 한 줄씩 JSON Lines 로 기록 (같은 시각 레코드도 모두 보존)
+# mode='a' 면 기존 파일 끝에 덧붙임
+def write_ndjson(items, file, epoch_of, mode='w'):
+    count = 0
+    with open(file, mode, encoding='utf-8') as f:
+        for timestamp, message in items:
+            f.write(ndjson_line(timestamp, message, epoch_of(timestamp)))
+            count += 1
+    return count
+
+
+# json.dump(dict(items), indent=2) 와 같은 내용을 레코드가 들어오는 대로 기록
+# 시간 순으로 정렬된 입력이라면 같은 시각의 레코드끼리만 모아 중복 timestamp 를 합치므로
+# (dict 와 같이 처음 위치에 마지막 값) 메모리는 같은 시각 레코드 수로 제한됨
+def write_json_object(items, file, epoch_of):
+    count = 0
+    with open(file, 'w', encoding='utf-8') as f:
+        group = {}
+        group_epoch = None
+
+        def flush():
+            nonlocal count
+            for timestamp, message in group.items():
+                f.write('{\n' if count == 0 else ',\n')
+                f.write(f'  {json.dumps(timestamp, ensure_ascii=False)}: '
+                        f'{json.dumps(message, ensure_ascii=False)}')
+                count += 1
+            group.clear()
+
+        for timestamp, message in items:
+            epoch = epoch_of(timestamp)
+            if epoch != group_epoch:
+                flush()
+                group_epoch = epoch
+            group[timestamp] = message
+        flush()
+        f.write('{}' if count == 0 else '\n}')
+    return count
+
+
+# json.dump(indent=2) 로 저장한 {timestamp: message} JSON 의 항목 한 줄을 (timestamp, message) 로 변환
+def _parse_json_entry(line):
+    entry = json.loads(b'{' + line.rstrip(b'\r\n,') + b'}')
+    return next(iter(entry.items()))
+
+
+# {timestamp: message} JSON 파일(항목마다 한 줄)을 한 줄씩 읽어 (바이트 위치, timestamp, message) 반환
+def iter_json_entries(file):
+    with open(file, 'rb') as f:
+        offset = 0
+        for line in f:
+            start = offset
+            offset += len(line)
+            if line.strip() in (b'{', b'}', b'{}', b''):
+                continue
+            timestamp, message = _parse_json_entry(line)
+            yield start, timestamp, message
+
+
+# 지정한 바이트 위치의 항목만 읽어 (timestamp, message) 반환
+def read_json_entries(file, offsets):
+    with open(file, 'rb') as f:
+        for offset in offsets:
+            f.seek(offset)
+            yield _parse_json_entry(f.readline())
+
+
+# 고정 길이 헤더 + timestamp/message UTF-8 바이트로 된 간단한 바이너리 레코드 형식
+def write_binary_records(items, file, epoch_of):
+    count = 0
+    with open(file, 'wb') as f:
+        f.write(BINARY_MAGIC)
+        for timestamp, message in items:
+            ts_bytes = timestamp.encode('utf-8')
+            msg_bytes = message.encode('utf-8')
+            f.write(BINARY_HEADER.pack(epoch_of(timestamp), len(ts_bytes), len(msg_bytes)))
+            f.write(ts_bytes)
+            f.write(msg_bytes)
+            count += 1
+    return count
+
+
+def iter_binary_records(file):
+    with open(file, 'rb') as f:
+        if f.readline() != BINARY_MAGIC:
+            raise ValueError(f'바이너리 레코드 파일 형식이 아닙니다: {file}')
+        while True:
+            header = f.read(BINARY_HEADER.size)
+            if not header:
+                break
+            if len(header) != BINARY_HEADER.size:
+                raise ValueError(f'바이너리 레코드 파일이 잘려 있습니다: {file}')
+            epoch, ts_length, msg_length = BINARY_HEADER.unpack(header)
+            timestamp = f.read(ts_length).decode('utf-8')
+            message = f.read(msg_length).decode('utf-8')
+            yield {'timestamp': timestamp, 'epoch': epoch, 'message': message}
+
+
+# pos 이상에서 시작하는 첫 번째 줄의 (시작 위치, 레코드)
+def _record_from(f, pos):
+    if pos > 0:
+        f.seek(pos - 1)
+        f.readline()
+    else:
+        f.seek(0)
+    start = f.tell()
+    line = f.readline()
+    if not line:
+        return start, None
+    return start, json.loads(line)
+
+
+# 시간 순으로 기록된 JSON Lines 파일에서 정렬 키가 target 보다 큰 첫 줄의 시작 위치
+# (없으면 파일 크기, 파일 바이트 위치를 이분 탐색하므로 몇 줄만 읽음)
+def ndjson_upper_bound(file, target, key_of):
+    with open(file, 'rb') as f:
+        lo, hi = 0, os.fstat(f.fileno()).st_size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            _, record = _record_from(f, mid)
+            if record is None or key_of(record['timestamp']) > target:
+                hi = mid
+            else:
+                lo = mid + 1
+        start, _ = _record_from(f, lo)
+    return start
+
+
+# 시간 역순으로 기록된 NDJSON 파일 위의 timestamp -> 레코드들 multimap
+# 메모리에 색인을 두지 않고 파일 바이트 위치를 이분 탐색하므로 메모리 사용량이 로그 크기와 무관
+# 레코드 순서는 epoch 값(초) 대신 timestamp 의 정렬 키(key_of)로 비교해 같은 초 안의 시각도 구분
+class TimestampMultimap:
+    def __init__(self, file, key_of):
+        self.file = file
+        self.key_of = key_of
+
+    def _key(self, record):
+        return self.key_of(record['timestamp'])
+
+    def get(self, timestamp):
+        target = self.key_of(timestamp)
+        results = []
+        with open(self.file, 'rb') as f:
+            lo, hi = 0, os.fstat(f.fileno()).st_size
+            # 정렬 키가 target 이하인 첫 줄의 위치를 찾음
+            while lo < hi:
+                mid = (lo + hi) // 2
+                _, record = _record_from(f, mid)
+                if record is None or self._key(record) <= target:
+                    hi = mid
+                else:
+                    lo = mid + 1
+
+            _, record = _record_from(f, lo)
+            while record is not None and self._key(record) == target:
+                results.append(record)
+                line = f.readline()
+                record = json.loads(line) if line else None
+        return results
+
+    def __getitem__(self, timestamp):
+        results = self.get(timestamp)
+        if not results:
+            raise KeyError(timestamp)
+        return results
+
+    def __contains__(self, timestamp):
+        return bool(self.get(timestamp))
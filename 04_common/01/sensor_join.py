@@ -0,0 +1,88 @@
+import json
+import logging
+
+# DummySensor.get_env 가 mars_sensor_log.txt 에 기록하는 순서
+SENSOR_FIELDS = (
+    'mars_base_internal_temperature',
+    'mars_base_external_temperature',
+    'mars_base_internal_humidity',
+    'mars_base_external_illuminance',
+    'mars_base_internal_co2',
+    'mars_base_internal_oxygen',
+)
+UNIT_SUFFIXES = ('W/m2', '도', '%')
+
+
+def _parse_value(raw):
+    for suffix in UNIT_SUFFIXES:
+        if raw.endswith(suffix):
+            raw = raw[:-len(suffix)]
+            break
+    # set_env 전에 기록된 값은 None 으로 남아 있음
+    return None if raw == 'None' else float(raw)
+
+
+# 예) 2025-08-08 19:29:42, 20.625도, 16.997도, 50.217%, 544.741W/m2, 0.063%, 4.323%
+def parse_sensor_line(line):
+    parts = [part.strip() for part in line.split(',')]
+    if len(parts) != len(SENSOR_FIELDS) + 1:
+        raise ValueError(f'센서 로그 형식이 아닙니다: {line.strip()}')
+    values = {field: _parse_value(raw) for field, raw in zip(SENSOR_FIELDS, parts[1:])}
+    return parts[0], values
+
+
+# 센서 로그를 한 줄씩 읽어 (epoch, (timestamp, values)) 로 반환 (형식이 맞지 않는 줄은 건너뜀)
+def iter_sensor_readings(file, epoch_of):
+    with open(file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                timestamp, values = parse_sensor_line(line)
+                epoch = epoch_of(timestamp)
+            except ValueError:
+                logging.warning('[ERROR] 센서 로그 형식 불일치: %s', line.strip())
+                continue
+            yield epoch, (timestamp, values)
+
+
+# 시간 순 (epoch, event) 스트림과 (epoch, reading) 스트림의 as-of 병합 조인
+# 각 event 에 그 시각 이하의 가장 최근 reading 을 붙임
+# (앞선 reading 이 없거나 tolerance 보다 오래됐으면 None, tolerance 는 epoch 와 같은 단위)
+# 두 스트림을 한 번씩만 앞으로 읽으므로 메모리는 reading 하나 분량
+def asof_join(events, readings, tolerance=None):
+    readings = iter(readings)
+    current = None
+    pending = next(readings, None)
+    last_epoch = None
+    for epoch, event in events:
+        if last_epoch is not None and epoch < last_epoch:
+            raise ValueError('event 가 시간 순으로 정렬되어 있지 않습니다.')
+        last_epoch = epoch
+        while pending is not None and pending[0] <= epoch:
+            if current is not None and pending[0] < current[0]:
+                raise ValueError('센서 기록이 시간 순으로 정렬되어 있지 않습니다.')
+            current = pending
+            pending = next(readings, None)
+        reading = current
+        if reading is not None and tolerance is not None and epoch - reading[0] > tolerance:
+            reading = None
+        yield epoch, event, None if reading is None else reading[1]
+
+
+# 조인 결과를 한 줄에 하나씩 JSON Lines 로 기록하고 (전체 건수, 센서 값이 붙은 건수) 반환
+def write_joined(joined, file):
+    count = matched = 0
+    with open(file, 'w', encoding='utf-8') as f:
+        for epoch, (timestamp, event, message), reading in joined:
+            sensor = None
+            if reading is not None:
+                sensor_timestamp, values = reading
+                sensor = {'timestamp': sensor_timestamp, **values}
+            record = {'timestamp': timestamp, 'event': event, 'message': message,
+                      'sensor': sensor}
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+            matched += reading is not None
+    return count, matched
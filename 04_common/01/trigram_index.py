@@ -0,0 +1,124 @@
+import json
+import os
+from array import array
+
+MAGIC = b'TRIGRAM2\n'
+GRAM = 3
+
+
+def trigrams(text):
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+# 원본 파일(JSON)이 바뀌었는지 확인하기 위한 지문 (크기 + 수정 시각)
+def file_fingerprint(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+# 메시지 trigram -> 레코드 번호 posting list 역색인
+# 검색어의 trigram posting list 를 교집합해 후보만 남기고,
+# 후보에 대해서만 `query in message` 로 확인하므로 결과는 선형 검색과 동일
+# 레코드마다 원본 파일에서의 바이트 위치도 함께 저장해, 후보 레코드만 원본에서 찾아 읽을 수 있음
+class TrigramIndex:
+    def __init__(self, count, directory, postings_reader, fingerprint=None,
+                 offsets_reader=None):
+        self.count = count
+        self.fingerprint = fingerprint
+        self._directory = directory
+        self._read_postings = postings_reader
+        self._read_offsets = offsets_reader
+
+    # entries 는 (원본 파일에서의 바이트 위치, 메시지)
+    @classmethod
+    def build(cls, entries, fingerprint=None):
+        postings = {}
+        offsets = array('Q')
+        for record_id, (offset, message) in enumerate(entries):
+            for gram in trigrams(message):
+                ids = postings.get(gram)
+                if ids is None:
+                    ids = postings[gram] = array('I')
+                ids.append(record_id)
+            offsets.append(offset)
+        return cls(len(offsets), postings, postings.__getitem__, fingerprint,
+                   lambda ids: [offsets[record_id] for record_id in ids])
+
+    # 레코드 번호들의 원본 파일 바이트 위치
+    def offsets(self, ids):
+        return self._read_offsets(ids)
+
+    # 파일 구성: MAGIC / 헤더 JSON 한 줄 / posting list (uint32) 연속 배열 / 레코드 위치 (uint64) 배열
+    # 헤더의 directory 는 trigram -> [시작 위치, 개수]
+    def save(self, path):
+        directory = {}
+        position = 0
+        for gram in self._directory:
+            length = len(self._read_postings(gram))
+            directory[gram] = [position, length]
+            position += length
+        header = {
+            'count': self.count,
+            'fingerprint': self.fingerprint,
+            'directory': directory,
+        }
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(json.dumps(header, ensure_ascii=False).encode('utf-8'))
+            f.write(b'\n')
+            for gram in self._directory:
+                ids = self._read_postings(gram)
+                if not isinstance(ids, array):
+                    ids = array('I', ids)
+                ids.tofile(f)
+            array('Q', self.offsets(range(self.count))).tofile(f)
+
+    # 헤더만 읽고 posting list 는 검색할 때 필요한 것만 파일에서 읽음
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            if f.readline() != MAGIC:
+                raise ValueError(f'trigram 색인 파일 형식이 아닙니다: {path}')
+            header = json.loads(f.readline().decode('utf-8'))
+            data_start = f.tell()
+
+        item_size = array('I').itemsize
+        offset_size = array('Q').itemsize
+        offsets_start = data_start + item_size * sum(
+            length for _, length in header['directory'].values())
+
+        def read_postings(gram):
+            start, length = header['directory'][gram]
+            ids = array('I')
+            with open(path, 'rb') as f:
+                f.seek(data_start + start * item_size)
+                ids.fromfile(f, length)
+            return ids
+
+        # 필요한 레코드의 위치만 찾아 읽음
+        def read_offsets(ids):
+            offsets = array('Q')
+            with open(path, 'rb') as f:
+                for record_id in ids:
+                    f.seek(offsets_start + record_id * offset_size)
+                    offsets.fromfile(f, 1)
+            return offsets.tolist()
+
+        return cls(header['count'], header['directory'], read_postings,
+                   header.get('fingerprint'), read_offsets)
+
+    # query 를 포함할 수 있는 레코드 번호 (짧은 검색어는 None -> 전체 검색 필요)
+    def candidates(self, query):
+        grams = trigrams(query)
+        if not grams:
+            return None
+        if any(gram not in self._directory for gram in grams):
+            return []
+
+        postings = sorted((self._read_postings(gram) for gram in grams), key=len)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result.intersection_update(ids)
+            if not result:
+                break
+        return sorted(result)
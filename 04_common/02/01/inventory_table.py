@@ -0,0 +1,141 @@
+import itertools
+import json
+from functools import reduce
+
+import numpy as np
+
+# csv.writer 기본값과 같은 줄 끝 (QUOTE_MINIMAL 로 따옴표가 필요한 문자)
+LINE_TERMINATOR = '\r\n'
+QUOTE_TRIGGERS = (',', '"', '\r', '\n')
+# 한 번에 열 배열로 바꿀 행 수 (행 단위 Python 문자열은 이만큼만 메모리에 머묾)
+ROW_CHUNK = 65536
+
+
+# 문자열 배열을 float 배열로 변환 ("Various" 처럼 숫자가 아닌 값은 NaN)
+def to_float_array(values):
+    try:
+        return values.astype(np.float64)
+    except ValueError:
+        pass
+
+    def parse(value):
+        try:
+            return float(value)
+        except ValueError:
+            return np.nan
+
+    # 서로 다른 값만 변환한 뒤 다시 펼침 (Flammability 처럼 값의 종류가 적은 열에서 빠름)
+    uniques, inverse = np.unique(values, return_inverse=True)
+    parsed = np.fromiter((parse(value) for value in uniques.tolist()), dtype=np.float64,
+                         count=len(uniques))
+    return parsed[inverse.reshape(-1)]
+
+
+# csv.writer(QUOTE_MINIMAL) 와 같은 규칙으로 필드 배열을 한꺼번에 quoting
+def quote_column(values):
+    needs_quote = np.zeros(len(values), dtype=bool)
+    for char in QUOTE_TRIGGERS:
+        needs_quote |= np.char.find(values, char) >= 0
+    if not needs_quote.any():
+        return values
+    quoted = np.char.add(np.char.add('"', np.char.replace(values, '"', '""')), '"')
+    return np.where(needs_quote, quoted, values)
+
+
+# 재고를 열 단위로 보관 (각 열은 문자열 배열, Flammability 는 float 배열로 한 번만 변환)
+# 정렬은 argsort, 필터는 boolean mask 로 처리해 행마다 float() 를 반복하지 않음
+class InventoryTable:
+    def __init__(self, header, columns, flammability):
+        self.header = header
+        self.columns = columns
+        self.flammability = flammability
+
+    @classmethod
+    def from_rows(cls, header, rows, flammability_column='Flammability'):
+        idx = header.index(flammability_column)
+        width = len(header)
+
+        def valid_rows():
+            for row in rows:
+                if len(row) != width:
+                    print(f'[ERROR] 파일 형식 불일치 ({width}분할 실패): {row}')
+                    continue
+                yield row
+
+        # ROW_CHUNK 행씩 열별 배열로 바꿔 모은 뒤 열마다 이어 붙임
+        # (열마다 그 열에서 가장 긴 값 기준 폭을 쓰므로 긴 열 하나가 다른 열의 크기를 키우지 않음)
+        parts = [[] for _ in range(width)]
+        valid = valid_rows()
+        while True:
+            chunk = list(itertools.islice(valid, ROW_CHUNK))
+            if not chunk:
+                break
+            for column_parts, cells in zip(parts, zip(*chunk)):
+                column_parts.append(np.array(cells, dtype=str))
+        columns = [np.concatenate(column_parts) if column_parts else np.array([], dtype=str)
+                   for column_parts in parts]
+        return cls(header, columns, to_float_array(columns[idx]))
+
+    # 열 배열과 Flammability 를 npz 로 저장 (meta 는 캐시 유효성 확인용 정보)
+    def save(self, path, meta=None):
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                flammability=self.flammability,
+                header=np.array(json.dumps(self.header, ensure_ascii=False)),
+                meta=np.array(json.dumps(meta, ensure_ascii=False)),
+                **{f'column_{i}': column for i, column in enumerate(self.columns)},
+            )
+
+    # 저장된 npz 파일에서 (InventoryTable, meta) 로드
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            header = json.loads(str(data['header']))
+            table = cls(header, [data[f'column_{i}'] for i in range(len(header))],
+                        data['flammability'])
+            meta = json.loads(str(data['meta']))
+        return table, meta
+
+    def __len__(self):
+        return len(self.flammability)
+
+    # Flammability 가 숫자인 행
+    def valid_mask(self):
+        return ~np.isnan(self.flammability)
+
+    # Flammability 가 threshold 이상인 행 (NaN 은 비교 결과가 False 이므로 제외됨)
+    def danger_mask(self, threshold):
+        return self.flammability >= threshold
+
+    # 오름차순 thresholds 에서 각 행이 넘는 가장 높은 기준의 번호 (어느 기준에도 못 미치거나 NaN 이면 -1)
+    def tier_codes(self, thresholds):
+        codes = np.searchsorted(np.asarray(thresholds, dtype=np.float64),
+                                self.flammability, side='right') - 1
+        codes[np.isnan(self.flammability)] = -1
+        return codes
+
+    def take(self, indices):
+        return InventoryTable(self.header, [column[indices] for column in self.columns],
+                              self.flammability[indices])
+
+    def filter(self, mask):
+        return self.take(np.flatnonzero(mask))
+
+    # Flammability 내림차순 (같은 값은 원래 순서 유지, NaN 은 맨 뒤)
+    def sort_desc(self):
+        return self.take(np.argsort(-self.flammability, kind='stable'))
+
+    def rows(self):
+        return [list(row) for row in zip(*(column.tolist() for column in self.columns))]
+
+    # 헤더와 모든 행을 csv.writer 와 같은 형식으로 한 번에 기록
+    def to_csv(self, path):
+        lines = [','.join(quote_column(np.array(self.header, dtype=str)).tolist())]
+        if len(self):
+            fields = [quote_column(column) for column in self.columns]
+            lines += reduce(lambda left, right: np.char.add(np.char.add(left, ','), right),
+                            fields).tolist()
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(LINE_TERMINATOR.join(lines))
+            f.write(LINE_TERMINATOR)
@@ -1,97 +1,426 @@
 import os
 import csv
+import argparse
+import contextlib
+import hashlib
+import heapq
+import itertools
+import json
+import math
+from bisect import bisect_right
+from collections import Counter
+from operator import itemgetter
+
+from inventory_table import InventoryTable
 
 BASE_DIR = os.path.dirname(__file__)
 INPUT_CSV = os.path.join(BASE_DIR, 'Mars_Base_Inventory_List.csv')
 DANGER_CSV = os.path.join(BASE_DIR, 'Mars_Base_Inventory_danger.csv')
 FLAMMABILITY_KEY = 'flammability_index'
 DANGER_THRESHOLD = 0.7
+# 위험 등급 이름=최소 Flammability (등급마다 Mars_Base_Inventory_<등급>.csv 로 저장)
+DEFAULT_TIERS = 'critical=0.9,high=0.7,moderate=0.4'
+TIER_CSV = os.path.join(BASE_DIR, 'Mars_Base_Inventory_{tier}.csv')
+SNAPSHOT_FILE = os.path.join(BASE_DIR, 'Mars_Base_Inventory.snapshot.json')
+# 스냅샷 비교 결과에서 종류마다 출력할 최대 물질 수
+REPORT_LIMIT = 20
+# 콘솔에 미리 보여줄 위험 물질 수 기본값
+DEFAULT_PREVIEW = 10
+
+
+# csv 모듈로 한 행씩 읽어 앞뒤 공백을 제거해 반환 (따옴표 안의 쉼표도 처리, 빈 줄 무시)
+def iter_rows(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            row = [col.strip() for col in row]
+            if any(row):
+                yield row
 
 
-def read_file(path):
+def flammability_index(header):
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            raw = f.read()
-        print('---------------print log file---------------')
-        print(raw)
-        return raw
-    except FileNotFoundError:
-        print('[ERROR] 파일이 없습니다')
+        return header.index("Flammability")
+    except ValueError:
+        raise ValueError("'Flammability' 컬럼을 찾을 수 없습니다.")
+
+
+# 행을 한 번만 훑으면서 Flammability 가 threshold 이상인 행만 (flammability, row) 로 반환
+def iter_danger_rows(rows, idx, threshold=DANGER_THRESHOLD, width=None):
+    for row in rows:
+        if width is not None and len(row) != width:
+            print(f'[ERROR] 파일 형식 불일치 ({width}분할 실패): {row}')
+            continue
+        try:
+            flammability = float(row[idx])
+        except ValueError:
+            print(f'[ERROR] Flammability 값이 숫자가 아닙니다: {row}')
+            continue
+        if flammability >= threshold:
+            yield flammability, row
+
+
+# 위험 행을 Flammability 내림차순으로 정렬
+# top_k 를 지정하면 크기 top_k 의 heap 으로 상위 k 개만 유지 (같은 값은 파일 순서 유지)
+def rank_danger_rows(danger_rows, top_k=None):
+    if top_k is None:
+        ranked = sorted(danger_rows, key=itemgetter(0), reverse=True)
+    else:
+        ranked = heapq.nlargest(top_k, danger_rows, key=itemgetter(0))
+    return [row for _, row in ranked]
+
+
+def save_danger_csv(header, rows, path=DANGER_CSV):
+    with open(path, 'w', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+# 재고 CSV 를 스트리밍으로 읽어 위험 물질만 골라 저장 (메모리에는 위험 행만 남김)
+def stream_danger_list(path=INPUT_CSV, threshold=DANGER_THRESHOLD, top_k=None, output=DANGER_CSV):
+    rows = iter_rows(path)
+    header = next(rows, None)
+    if header is None:
+        print('[ERROR] 빈 파일입니다')
         return
-    except UnicodeDecodeError:
-        print('[ERROR] 디코딩 오류 발생')
+    idx = flammability_index(header)
+    danger_rows = rank_danger_rows(iter_danger_rows(rows, idx, threshold, len(header)), top_k)
+    save_danger_csv(header, danger_rows, output)
+    return [header] + danger_rows
+
+
+def parse_table(path):
+    rows = iter_rows(path)
+    header = next(rows, None)
+    if header is None:
+        print('[ERROR] 빈 파일입니다')
         return
-    except Exception as e:
-        print(f'[ERROR] 데이터 읽는 중 알 수 없는 오류가 발생했습니다: {e}')
+    flammability_index(header)
+    return InventoryTable.from_rows(header, rows)
+
+
+def cache_file_for(path):
+    return f'{os.path.splitext(path)[0]}.cache.npz'
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# 캐시 유효성 확인용 지문: 경로 + 크기 + 수정 시각
+# content_hash 면 수정 시각 대신 내용 해시를 사용 (내용이 같은 파일을 다시 받아도 캐시 재사용)
+def inventory_fingerprint(path, content_hash=False):
+    stat = os.stat(path)
+    fingerprint = {'path': os.path.abspath(path), 'size': stat.st_size}
+    if content_hash:
+        fingerprint['sha256'] = file_sha256(path)
+    else:
+        fingerprint['mtime_ns'] = stat.st_mtime_ns
+    return fingerprint
+
+
+# 파싱한 재고 테이블을 입력 파일 옆 .cache.npz 에 캐시하고, 지문이 같으면 파싱 없이 로드
+def load_table(path, cache=False, content_hash=False):
+    if not cache:
+        return parse_table(path)
+
+    fingerprint = inventory_fingerprint(path, content_hash)
+    cache_file = cache_file_for(path)
+    try:
+        table, meta = InventoryTable.load(cache_file)
+        if meta == fingerprint:
+            return table
+    except (OSError, ValueError, KeyError):
+        pass
+
+    table = parse_table(path)
+    if table is not None:
+        try:
+            table.save(cache_file, fingerprint)
+            print(f'[INFO] 재고 캐시 저장됨: {cache_file}')
+        except Exception as e:
+            print(f'[ERROR] 재고 캐시 저장 실패: {e}')
+    return table
+
+
+# 열 단위 InventoryTable 로 읽어 mask 로 거르고 argsort 로 정렬한 뒤 한 번에 저장
+def columnar_danger_list(path=INPUT_CSV, threshold=DANGER_THRESHOLD, top_k=None, output=DANGER_CSV,
+                         cache=False, content_hash=False):
+    table = load_table(path, cache, content_hash)
+    if table is None:
         return
+    header = table.header
+    invalid = len(table) - int(table.valid_mask().sum())
+    if invalid:
+        print(f'[ERROR] Flammability 값이 숫자가 아닌 행 {invalid}개를 제외합니다')
+    danger = table.filter(table.danger_mask(threshold)).sort_desc()
+    if top_k is not None:
+        danger = danger.take(slice(0, top_k))
+    danger.to_csv(output)
+    return [header] + danger.rows()
 
 
-def raw_to_list(raw):
-    parsed: list[list[str]] = []
-    for line in raw.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        cols = [col.strip() for col in line.split(',')]
-        if len(cols) != 5:
-            print('[ERROR] 파일 형식 불일치 (5분할 실패)')
-            return None
-        parsed.append(cols)
-    return parsed
+# 'critical=0.9,high=0.7' -> 기준값 오름차순 ([이름...], [기준값...])
+def parse_tiers(spec):
+    tiers = []
+    for part in spec.split(','):
+        name, sep, threshold = part.partition('=')
+        if not sep or not name.strip():
+            raise ValueError(f'위험 등급 형식이 올바르지 않습니다: {part}')
+        tiers.append((float(threshold), name.strip()))
+    tiers.sort()
+    names = [name for _, name in tiers]
+    if len(set(names)) != len(names):
+        raise ValueError(f'위험 등급 이름이 중복되었습니다: {spec}')
+    return names, [threshold for threshold, _ in tiers]
 
 
-def sort_list(inventory_list):
-    header, *data = inventory_list
+# 파일을 한 번만 읽으면서 각 행을 bisect 로 등급에 배정하고 등급별 CSV 에 바로 기록 (파일 순서 유지)
+def stream_tiers(path, names, thresholds, output_pattern=TIER_CSV):
+    rows = iter_rows(path)
+    header = next(rows, None)
+    if header is None:
+        print('[ERROR] 빈 파일입니다')
+        return
+    idx = flammability_index(header)
+    counts = Counter({name: 0 for name in names})
+    with contextlib.ExitStack() as stack:
+        writers = []
+        for name in names:
+            f = stack.enter_context(open(output_pattern.format(tier=name), 'w', encoding='utf-8'))
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writers.append(writer)
+        for flammability, row in iter_danger_rows(rows, idx, thresholds[0], len(header)):
+            tier = bisect_right(thresholds, flammability) - 1
+            writers[tier].writerow(row)
+            counts[names[tier]] += 1
+    return counts
+
 
+# 열 단위로 읽어 searchsorted 로 모든 행의 등급을 한 번에 계산한 뒤 등급별로 저장
+def columnar_tiers(path, names, thresholds, output_pattern=TIER_CSV, cache=False, content_hash=False):
+    table = load_table(path, cache, content_hash)
+    if table is None:
+        return
+    codes = table.tier_codes(thresholds)
+    counts = Counter()
+    for tier, name in enumerate(names):
+        rows_in_tier = table.filter(codes == tier)
+        rows_in_tier.to_csv(output_pattern.format(tier=name))
+        counts[name] = len(rows_in_tier)
+    return counts
+
+
+def row_hash(row):
+    return hashlib.blake2b('\x1f'.join(row).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def load_snapshot(path):
     try:
-        idx = header.index("Flammability")
-    except ValueError:
-        raise ValueError("'Flammability' 컬럼을 찾을 수 없습니다.")
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return
+
+
+def save_snapshot(snapshot, path):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# 새 재고 파일을 한 번 훑으면서 Substance 별 행 해시를 이전 스냅샷과 비교
+# 스냅샷에는 행마다 [해시, 위험 물질 여부] 를 저장하고, 위험 물질이거나 위험 물질이었던 행이
+# 추가/삭제/변경된 경우에만 위험 물질 CSV 를 다시 씀
+# 반환값: (추가된 물질, 삭제된 물질, 변경된 물질, 위험 물질 CSV 를 다시 썼는지)
+def diff_snapshot(path=INPUT_CSV, snapshot_file=SNAPSHOT_FILE, threshold=DANGER_THRESHOLD,
+                  output=DANGER_CSV):
+    rows = iter_rows(path)
+    header = next(rows, None)
+    if header is None:
+        print('[ERROR] 빈 파일입니다')
+        return
+    idx = flammability_index(header)
+    key_idx = header.index('Substance') if 'Substance' in header else 0
+    width = len(header)
+
+    previous = load_snapshot(snapshot_file)
+    old_rows = {} if previous is None else previous['rows']
+    header_hash = row_hash(header)
+    danger_changed = previous is None or previous['threshold'] != threshold \
+        or previous['header'] != header_hash or not os.path.exists(output)
+
+    new_rows = {}
+    seen = Counter()
+    added, changed = [], []
+    danger_rows = []
+    for row in rows:
+        if len(row) != width:
+            print(f'[ERROR] 파일 형식 불일치 ({width}분할 실패): {row}')
+            continue
+        # 같은 Substance 가 여러 번 나오면 등장 순서로 구분
+        key = row[key_idx]
+        seen[key] += 1
+        if seen[key] > 1:
+            key = f'{key}#{seen[key]}'
+
+        try:
+            flammability = float(row[idx])
+        except ValueError:
+            flammability = math.nan
+        danger = flammability >= threshold
+        if danger:
+            danger_rows.append((flammability, row))
 
-    data_sorted = sorted(
-        data,
-        key=lambda row: float(row[idx]),
-        reverse=True
-    )
+        digest = row_hash(row)
+        new_rows[key] = [digest, danger]
+        old = old_rows.pop(key, None)
+        if old is None:
+            added.append(key)
+            danger_changed |= danger
+        elif old[0] != digest:
+            changed.append(key)
+            danger_changed |= danger or old[1]
+    removed = list(old_rows)
+    danger_changed |= any(danger for _, danger in old_rows.values())
 
-    return [header] + data_sorted
+    if danger_changed:
+        save_danger_csv(header, rank_danger_rows(danger_rows), output)
+    save_snapshot({'threshold': threshold, 'header': header_hash, 'rows': new_rows}, snapshot_file)
+    return added, removed, changed, danger_changed
 
 
-def flammability_filtering_and_save(sorted_list):
-    header, *data = sorted_list
+# 처음 limit 개만 출력하고 나머지는 생략 표시 (limit 이 None 이면 모두, 0 이면 출력하지 않음)
+def print_preview(title, header, items, limit):
+    if limit == 0:
+        return
+    print(f'---------------{title}---------------')
+    print(header)
+    items = iter(items)
+    for item in itertools.islice(items, limit):
+        print(item)
+    if limit is not None and next(items, None) is not None:
+        print(f'... (처음 {limit}건만 출력)')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='화성 기지 재고 위험 물질 분류')
+    parser.add_argument('--input', default=INPUT_CSV,
+                        help='재고 CSV 파일')
+    parser.add_argument('--output', default=DANGER_CSV,
+                        help='위험 물질 CSV 저장 경로')
+    parser.add_argument('--threshold', type=float, default=DANGER_THRESHOLD,
+                        help=f'위험 물질로 분류할 최소 Flammability (기본값 {DANGER_THRESHOLD})')
+    parser.add_argument('--columnar', action='store_true',
+                        help='NumPy 열 단위로 읽어 mask/argsort 로 분류')
+    parser.add_argument('--cache', action='store_true',
+                        help='파싱한 재고를 입력 파일 옆 .cache.npz 에 캐시해 다시 사용 (--columnar 로 동작)')
+    parser.add_argument('--cache-hash', action='store_true',
+                        help='--cache 의 유효성을 수정 시각 대신 파일 내용 해시(sha256)로 확인')
+    parser.add_argument('--tiers', nargs='?', const=DEFAULT_TIERS, default=None, metavar='NAME=MIN,...',
+                        help=f'여러 위험 등급으로 한 번에 분류해 등급별 CSV 저장 (기본값 {DEFAULT_TIERS})')
+    parser.add_argument('--snapshot', nargs='?', const=SNAPSHOT_FILE, default=None, metavar='SNAPSHOT',
+                        help='이전 스냅샷과 비교해 추가/삭제/변경된 물질을 보고하고, 위험 물질이 바뀐 경우에만 위험 물질 CSV 저장')
+    parser.add_argument('--top-k', type=int, default=None,
+                        help='Flammability 가 가장 높은 k 개만 저장 (heap 으로 k 개만 메모리에 유지)')
+    parser.add_argument('--preview', type=int, metavar='N', default=DEFAULT_PREVIEW,
+                        help=f'콘솔에 출력할 최대 위험 물질 수 (0 이면 출력 안 함, 음수면 모두, 기본값 {DEFAULT_PREVIEW})')
+    return parser.parse_args(argv)
 
+
+def run_tiers(args):
     try:
-        idx = header.index("Flammability")
-    except ValueError:
-        raise ValueError("'Flammability' 컬럼을 찾을 수 없습니다.")
+        names, thresholds = parse_tiers(args.tiers)
+        if args.columnar or args.cache:
+            counts = columnar_tiers(args.input, names, thresholds,
+                                    cache=args.cache, content_hash=args.cache_hash)
+        else:
+            counts = stream_tiers(args.input, names, thresholds)
+    except FileNotFoundError:
+        print('[ERROR] 파일이 없습니다')
+        return
+    except UnicodeDecodeError:
+        print('[ERROR] 디코딩 오류 발생')
+        return
+    except ValueError as e:
+        print(f'[ERROR] {e}')
+        return
+    if counts is None:
+        return
 
-    danger_rows = [row for row in data if float(row[idx]) >= DANGER_THRESHOLD]
+    print('---------------print danger tiers---------------')
+    for name, threshold in sorted(zip(names, thresholds), key=itemgetter(1), reverse=True):
+        print(f"{name} (>= {threshold}): {counts[name]}건 -> {TIER_CSV.format(tier=name)}")
 
-    with open(DANGER_CSV, 'w', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        writer.writerows(danger_rows)
 
-    return [header] + danger_rows
+def run_snapshot(args):
+    try:
+        result = diff_snapshot(args.input, args.snapshot, args.threshold, args.output)
+    except FileNotFoundError:
+        print('[ERROR] 파일이 없습니다')
+        return
+    except UnicodeDecodeError:
+        print('[ERROR] 디코딩 오류 발생')
+        return
+    except ValueError as e:
+        print(f'[ERROR] {e}')
+        return
+    if result is None:
+        return
+
+    added, removed, changed, danger_changed = result
+    print('---------------print inventory changes---------------')
+    for title, keys in (('추가', added), ('삭제', removed), ('변경', changed)):
+        print(f'{title}: {len(keys)}건')
+        for key in keys[:REPORT_LIMIT]:
+            print(f'  {key}')
+        if len(keys) > REPORT_LIMIT:
+            print(f'  ... (처음 {REPORT_LIMIT}건만 출력)')
+    if danger_changed:
+        print(f'[INFO] 위험 물질이 바뀌어 다시 저장함: {args.output}')
+    else:
+        print('[INFO] 위험 물질 변경 없음 (위험 물질 CSV 유지)')
 
 
-def main():
-    inventory = read_file(INPUT_CSV)
-    if inventory is None:
+def main(argv=None):
+    args = parse_args(argv)
+    args.cache = args.cache or args.cache_hash
+    if args.tiers is not None:
+        run_tiers(args)
         return
 
-    inventory_list = raw_to_list(inventory)
-    if inventory_list is None:
+    if args.snapshot is not None:
+        run_snapshot(args)
         return
 
-    sorted_list = sort_list(inventory_list)
-    if sorted_list is None:
+    try:
+        if args.columnar or args.cache:
+            danger_list = columnar_danger_list(args.input, args.threshold, args.top_k, args.output,
+                                               args.cache, args.cache_hash)
+        else:
+            danger_list = stream_danger_list(args.input, args.threshold, args.top_k, args.output)
+    except FileNotFoundError:
+        print('[ERROR] 파일이 없습니다')
+        return
+    except UnicodeDecodeError:
+        print('[ERROR] 디코딩 오류 발생')
+        return
+    except ValueError as e:
+        print(f'[ERROR] {e}')
+        return
+    if danger_list is None:
         return
 
-    danger_list = flammability_filtering_and_save(sorted_list)
-    print('---------------print sorted danger list---------------')
-    for row in danger_list:
-        print(row)
+    header, *danger_rows = danger_list
+    print(f'[INFO] 위험 물질 {len(danger_rows)}건 저장됨: {args.output}')
+    print_preview('print sorted danger list', header, danger_rows,
+                  None if args.preview < 0 else args.preview)
 
 
 if __name__ == '__main__':
@@ -1,9 +1,45 @@
 import math
+import os
+import csv
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 MATERIAL = {'glass', 'aluminum', 'carbon_steel'}
 MARS_GRAVITY_FACTOR = 0.38
 RESULT = {}
 
+# 배치 계산용 재질 번호 -> 밀도(g/cm³) 표
+MATERIAL_NAMES = ('glass', 'aluminum', 'carbon_steel')
+DENSITY = np.array([2.4, 2.7, 7.85])
+MATERIAL_CODES = {name: code for code, name in enumerate(MATERIAL_NAMES)}
+
+# sphere_area_batch 의 오류 번호 -> sphere_area 와 같은 오류 메시지 (0 은 정상)
+ERROR_MESSAGES = (
+    '',
+    '숫자 형식이 아닙니다.',
+    '0보다 큰 값을 입력해야합니다.',
+    '유효하지 않은 재질입니다.',
+    '두께는 숫자 형식이어야 합니다.',
+    '두께는 0보다 커야 합니다.',
+)
+BATCH_COLUMNS = ('diameter', 'material', 'thickness')
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Pareto frontier 기본 격자: (최소, 최대, 개수)
+DEFAULT_DIAMETER_GRID = (1.0, 200.0, 2000)
+DEFAULT_THICKNESS_GRID = (0.1, 20.0, 1000)
+
+# Monte Carlo 공차 분석 기본값
+DEFAULT_SAMPLES = 1_000_000
+MC_CHUNK_SIZE = 1_000_000
+PERCENTILES = (1, 5, 50, 95, 99)
+# 백분위수를 구할 무게 히스토그램 구간 수와 범위 (공칭값 ± MC_SIGMA_RANGE 표준편차)
+MC_BINS = 1 << 16
+MC_SIGMA_RANGE = 8
+
 
 def sphere_area(diameter, material, thickness=1.0):
     try:
@@ -48,7 +84,393 @@ def sphere_area(diameter, material, thickness=1.0):
     return area, m_mars
 
 
-def main():
+# 재질 이름 배열 -> 재질 번호 배열 (앞뒤 공백/대소문자 무시, 모르는 재질은 -1)
+def encode_materials(names):
+    names = np.asarray(names, dtype=str)
+    uniques, inverse = np.unique(np.char.lower(np.char.strip(names)), return_inverse=True)
+    codes = np.array([MATERIAL_CODES.get(name, -1) for name in uniques.tolist()], dtype=np.int64)
+    return codes[inverse.reshape(names.shape)]
+
+
+# 문자열 배열 -> float 배열 (숫자가 아니면 NaN, 빈 값은 default)
+def to_float_array(values, default=np.nan):
+    values = np.asarray(values, dtype=str)
+    uniques, inverse = np.unique(np.char.strip(values), return_inverse=True)
+
+    def parse(value):
+        if value == '':
+            return default
+        try:
+            return float(value)
+        except ValueError:
+            return np.nan
+
+    parsed = np.fromiter((parse(value) for value in uniques.tolist()), dtype=np.float64,
+                         count=len(uniques))
+    return parsed[inverse.reshape(values.shape)]
+
+
+# sphere_area 의 검사를 mask 로 수행해 설계마다 오류 번호 반환 (앞선 검사가 우선)
+def validate_batch(diameters, material_codes, thicknesses):
+    errors = np.zeros(diameters.shape, dtype=np.int8)
+    checks = (
+        (1, np.isnan(diameters)),
+        (2, ~(diameters > 0)),
+        (3, (material_codes < 0) | (material_codes >= len(DENSITY))),
+        (4, np.isnan(thicknesses)),
+        (5, ~(thicknesses > 0)),
+    )
+    # 뒤의 검사부터 덮어써서 앞선 검사의 오류 번호가 남도록 함
+    for code, failed in reversed(checks):
+        errors[failed] = code
+    return errors
+
+
+# 여러 설계의 면적과 화성 무게를 한 번에 계산 (배열끼리는 broadcasting)
+# material_codes 는 MATERIAL_NAMES 의 번호, 오류가 있는 설계의 결과는 NaN
+# 반환값: (면적, 화성 무게, 오류 번호 배열 - ERROR_MESSAGES 참고)
+def sphere_area_batch(diameters, material_codes, thicknesses=1.0):
+    diameters, material_codes, thicknesses = np.broadcast_arrays(
+        np.asarray(diameters, dtype=np.float64),
+        np.asarray(material_codes, dtype=np.int64),
+        np.asarray(thicknesses, dtype=np.float64),
+    )
+    errors = validate_batch(diameters, material_codes, thicknesses)
+    valid = errors == 0
+    density = DENSITY[np.where(valid, material_codes, 0)]
+
+    r = diameters / 2
+    area = 2 * np.pi * r * r
+    m = (area * thicknesses * 10000 * density) / 1000
+    m_mars = m * MARS_GRAVITY_FACTOR
+    return np.where(valid, area, np.nan), np.where(valid, m_mars, np.nan), errors
+
+
+# 화성 무게는 지름² × 두께에 비례하므로 무게 = 계수 × 지름² × 두께
+# 재질별 계수는 sphere_area_batch 로 지름 1m, 두께 1cm 설계의 무게를 계산해 구함
+def mass_coefficients():
+    _, mass, _ = sphere_area_batch(1.0, np.arange(len(MATERIAL_NAMES)), 1.0)
+    return mass
+
+
+# closed-form 해를 sphere_area_batch 로 다시 계산해 반올림 오차로 예산을 넘으면 바로 아래 값으로 내림
+def _fit_budget(values, budget, mass_of):
+    over = mass_of(values) > budget
+    return np.where(over, np.nextafter(values, 0), values)
+
+
+def _solver_inputs(budget, material_codes, fixed):
+    budget, material_codes, fixed = np.broadcast_arrays(
+        np.asarray(budget, dtype=np.float64),
+        np.asarray(material_codes, dtype=np.int64),
+        np.asarray(fixed, dtype=np.float64),
+    )
+    valid = (budget > 0) & (fixed > 0) & (material_codes >= 0) & (material_codes < len(DENSITY))
+    coefficients = mass_coefficients()[np.where(valid, material_codes, 0)]
+    return budget, material_codes, fixed, coefficients, valid
+
+
+# 화성 무게 budget(kg) 안에서 두께가 thickness(cm) 일 때 가능한 최대 지름(m) (입력이 잘못되면 NaN)
+def solve_diameter(budget, material_codes, thickness=1.0):
+    budget, material_codes, thickness, coefficients, valid = _solver_inputs(
+        budget, material_codes, thickness)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        diameter = np.sqrt(budget / (coefficients * thickness))
+    diameter = _fit_budget(diameter, budget,
+                           lambda d: sphere_area_batch(d, material_codes, thickness)[1])
+    return np.where(valid, diameter, np.nan)
+
+
+# 지름이 diameter(m) 인 돔의 화성 무게가 budget(kg) 이 되는 두께(cm)
+# 무게는 두께에 비례하므로 예산 안의 최대 두께이자, 목표 무게(차폐량 등)를 채우는 최소 두께
+def solve_thickness(budget, material_codes, diameter):
+    budget, material_codes, diameter, coefficients, valid = _solver_inputs(
+        budget, material_codes, diameter)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        thickness = budget / (coefficients * diameter * diameter)
+    thickness = _fit_budget(thickness, budget,
+                            lambda t: sphere_area_batch(diameter, material_codes, t)[1])
+    return np.where(valid, thickness, np.nan)
+
+
+# 지름 x 두께 격자의 모든 설계를 한 번에 계산하고, 재질마다 무게 budget 안에서
+# 지름과 두께를 동시에 더 키울 수 없는 설계들(Pareto frontier)을 두께 오름차순으로 반환
+def pareto_frontier(budget, diameters, thicknesses, material_codes=None):
+    diameters = np.unique(np.asarray(diameters, dtype=np.float64))
+    thicknesses = np.unique(np.asarray(thicknesses, dtype=np.float64))
+    diameters = diameters[diameters > 0]
+    thicknesses = thicknesses[thicknesses > 0]
+    if material_codes is None:
+        material_codes = np.arange(len(MATERIAL_NAMES))
+    material_codes = np.asarray(material_codes, dtype=np.int64)
+
+    # (재질, 두께, 지름) 축으로 broadcasting
+    area, mass, errors = sphere_area_batch(diameters[None, None, :],
+                                           material_codes[:, None, None],
+                                           thicknesses[None, :, None])
+    feasible = (errors == 0) & (mass <= budget)
+
+    # 무게는 지름에 대해 증가하므로 가능한 지름은 앞쪽 연속 구간 -> 개수 - 1 이 최대 지름 위치
+    counts = feasible.sum(axis=2)
+    # 더 두꺼운 설계들의 최대 지름보다 커야 frontier 에 포함
+    from_thick = counts[:, ::-1]
+    best_thicker = np.maximum.accumulate(from_thick, axis=1)
+    previous = np.concatenate([np.zeros((len(material_codes), 1), dtype=counts.dtype),
+                               best_thicker[:, :-1]], axis=1)
+    on_frontier = (from_thick > previous)[:, ::-1]
+
+    m_idx, t_idx = np.nonzero(on_frontier)
+    d_idx = counts[m_idx, t_idx] - 1
+    return np.rec.fromarrays(
+        [np.array(MATERIAL_NAMES)[material_codes[m_idx]], diameters[d_idx], thicknesses[t_idx],
+         area[m_idx, t_idx, d_idx], mass[m_idx, t_idx, d_idx]],
+        names=('material', 'diameter', 'thickness', 'area', 'mass'),
+    )
+
+
+# Monte Carlo chunk 하나: 지름/두께를 정규분포로 뽑아 무게를 계산하고 히스토그램/합계만 반환
+# (ProcessPoolExecutor 작업 단위, 표본 배열은 chunk 크기만큼만 메모리에 있음)
+def _monte_carlo_chunk(material_code, diameter, thickness, diameter_sd, thickness_sd,
+                       size, seed, edges, budget):
+    rng = np.random.default_rng(seed)
+    diameters = rng.normal(diameter, diameter_sd, size)
+    thicknesses = rng.normal(thickness, thickness_sd, size)
+    _, mass, errors = sphere_area_batch(diameters, material_code, thicknesses)
+    mass = mass[errors == 0]
+    counts, _ = np.histogram(np.clip(mass, edges[0], edges[-1]), bins=edges)
+    over = int((mass > budget).sum()) if budget is not None else 0
+    return counts, len(mass), over, float(mass.sum()), float(np.square(mass).sum())
+
+
+# 누적 히스토그램에서 백분위수 (구간 안에서는 선형 보간, 오차는 구간 폭 이내)
+def _histogram_percentiles(counts, edges, percentiles):
+    cumulative = np.cumsum(counts)
+    total = cumulative[-1]
+    results = {}
+    for percentile in percentiles:
+        target = percentile / 100 * total
+        index = min(int(np.searchsorted(cumulative, target)), len(counts) - 1)
+        before = cumulative[index - 1] if index > 0 else 0
+        fraction = (target - before) / counts[index] if counts[index] else 0.0
+        results[percentile] = float(edges[index] + fraction * (edges[index + 1] - edges[index]))
+    return results
+
+
+# 지름(m)/두께(cm) 제조 공차를 정규분포(표준편차 diameter_sd, thickness_sd)로 보고
+# samples 개의 설계를 chunk_size 개씩 뽑아 화성 무게 분포를 계산
+# 각 chunk 는 히스토그램과 합계만 돌려주므로 메모리는 chunk 크기로 제한되고,
+# workers 를 지정하면 chunk 를 여러 프로세스에서 계산 (seed 가 같으면 workers 와 상관없이 같은 결과)
+# 지름이나 두께가 0 이하로 뽑힌 표본은 제외하고 invalid 로 셈
+def monte_carlo_mass(material_code, diameter, thickness=1.0, diameter_sd=0.0, thickness_sd=0.0,
+                     samples=DEFAULT_SAMPLES, budget=None, chunk_size=MC_CHUNK_SIZE,
+                     workers=None, seed=None, percentiles=PERCENTILES):
+    if diameter <= 0 or thickness <= 0:
+        raise ValueError('0보다 큰 값을 입력해야합니다.')
+    if diameter_sd < 0 or thickness_sd < 0:
+        raise ValueError('공차(표준편차)는 0 이상이어야 합니다.')
+    if samples < 1 or chunk_size < 1:
+        raise ValueError('표본 수와 chunk 크기는 1 이상이어야 합니다.')
+
+    # 히스토그램 범위: 지름/두께가 공칭값 ± MC_SIGMA_RANGE 표준편차일 때의 무게
+    low_d = max(diameter - MC_SIGMA_RANGE * diameter_sd, 0.0)
+    low_t = max(thickness - MC_SIGMA_RANGE * thickness_sd, 0.0)
+    _, bounds, _ = sphere_area_batch(
+        [low_d or np.finfo(float).tiny, diameter + MC_SIGMA_RANGE * diameter_sd], material_code,
+        [low_t or np.finfo(float).tiny, thickness + MC_SIGMA_RANGE * thickness_sd])
+    if np.isnan(bounds).any():
+        raise ValueError('유효하지 않은 재질입니다.')
+    edges = np.linspace(bounds[0], max(bounds[1], np.nextafter(bounds[0], np.inf)), MC_BINS + 1)
+
+    sizes = [min(chunk_size, samples - start) for start in range(0, samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(material_code, diameter, thickness, diameter_sd, thickness_sd, size, chunk_seed,
+              edges, budget) for size, chunk_seed in zip(sizes, seeds)]
+    if workers is not None and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            results = list(executor.map(_monte_carlo_chunk, *zip(*tasks)))
+    else:
+        results = [_monte_carlo_chunk(*task) for task in tasks]
+
+    counts = np.sum([result[0] for result in results], axis=0)
+    valid = sum(result[1] for result in results)
+    over = sum(result[2] for result in results)
+    total = sum(result[3] for result in results)
+    total_sq = sum(result[4] for result in results)
+    if valid == 0:
+        raise ValueError('유효한 표본이 없습니다.')
+    mean = total / valid
+    return {
+        'material': MATERIAL_NAMES[material_code],
+        'samples': samples,
+        'invalid': samples - valid,
+        'mean': mean,
+        'std': math.sqrt(max(total_sq / valid - mean * mean, 0.0)),
+        'percentiles': _histogram_percentiles(counts, edges, percentiles),
+        'exceed_probability': None if budget is None else over / valid,
+    }
+
+
+def _chunks(rows, size):
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# diameter,material,thickness CSV 를 chunk_size 행씩 읽어 계산하고 바로 결과 CSV 에 기록
+# 결과 열: diameter,material,thickness,area,mass,error (면적/무게는 소수점 셋째 자리)
+def run_batch_csv(input_csv, output_csv, chunk_size=DEFAULT_CHUNK_SIZE):
+    count = invalid = 0
+    with open(input_csv, 'r', encoding='utf-8', newline='') as src, \
+            open(output_csv, 'w', encoding='utf-8', newline='') as dst:
+        reader = csv.reader(src)
+        header = [col.strip().lower() for col in next(reader, [])]
+        missing = [col for col in BATCH_COLUMNS if col not in header]
+        if missing:
+            raise ValueError(f'입력 CSV 에 {", ".join(missing)} 열이 없습니다.')
+        indices = [header.index(col) for col in BATCH_COLUMNS]
+
+        writer = csv.writer(dst)
+        writer.writerow(BATCH_COLUMNS + ('area', 'mass', 'error'))
+        rows = (row for row in reader if row)
+        for chunk in _chunks(rows, chunk_size):
+            cells = np.array([[row[i] if i < len(row) else '' for i in indices] for row in chunk],
+                             dtype=str).reshape(-1, len(BATCH_COLUMNS))
+            diameters = to_float_array(cells[:, 0])
+            material_codes = encode_materials(cells[:, 1])
+            thicknesses = to_float_array(cells[:, 2], default=1.0)
+
+            area, mass, errors = sphere_area_batch(diameters, material_codes, thicknesses)
+            valid = errors == 0
+            area_text = np.where(valid, np.char.mod('%.3f', area), '')
+            mass_text = np.where(valid, np.char.mod('%.3f', mass), '')
+            messages = np.array(ERROR_MESSAGES)[errors]
+            writer.writerows(zip(cells[:, 0].tolist(), cells[:, 1].tolist(), cells[:, 2].tolist(),
+                                 area_text.tolist(), mass_text.tolist(), messages.tolist()))
+            count += len(chunk)
+            invalid += int((~valid).sum())
+    return count, invalid
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Mars 돔 구조물 설계')
+    parser.add_argument('--batch', metavar='INPUT_CSV', default=None,
+                        help='diameter,material,thickness 열의 CSV 를 한꺼번에 계산 (입력 대화 없이 실행)')
+    parser.add_argument('--output', default=None,
+                        help='--batch 결과 CSV 경로 (기본값은 <입력>_result.csv)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'--batch 에서 한 번에 계산할 행 수 (기본값 {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--budget', type=float, metavar='KG', default=None,
+                        help='화성 무게 예산: 재질별 최대 지름(--thickness 기준)과 두께(--diameter 기준) 계산')
+    parser.add_argument('--thickness', type=float, default=1.0,
+                        help='--budget 에서 최대 지름을 구할 두께(cm), 기본값 1cm')
+    parser.add_argument('--diameter', type=float, default=None,
+                        help='--budget 에서 두께를 구할 지름(m)')
+    parser.add_argument('--pareto', action='store_true',
+                        help='--budget 안에서 지름/두께 격자의 재질별 Pareto frontier 출력')
+    parser.add_argument('--grid-diameter', type=float, nargs=3, metavar=('MIN', 'MAX', 'N'),
+                        default=DEFAULT_DIAMETER_GRID, help='--pareto 지름 격자 (m)')
+    parser.add_argument('--grid-thickness', type=float, nargs=3, metavar=('MIN', 'MAX', 'N'),
+                        default=DEFAULT_THICKNESS_GRID, help='--pareto 두께 격자 (cm)')
+    parser.add_argument('--monte-carlo', action='store_true',
+                        help='--diameter/--thickness 설계의 제조 공차에 따른 재질별 무게 분포 계산 (--budget 초과 확률 포함)')
+    parser.add_argument('--material', choices=MATERIAL_NAMES, default=None,
+                        help='--monte-carlo 에서 계산할 재질 (기본값은 모든 재질)')
+    parser.add_argument('--diameter-sd', type=float, default=0.01,
+                        help='--monte-carlo 지름 공차 표준편차(m), 기본값 0.01')
+    parser.add_argument('--thickness-sd', type=float, default=0.05,
+                        help='--monte-carlo 두께 공차 표준편차(cm), 기본값 0.05')
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES,
+                        help=f'--monte-carlo 재질별 표본 수 (기본값 {DEFAULT_SAMPLES})')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='--monte-carlo chunk 를 나눠 계산할 프로세스 수')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='--monte-carlo 난수 seed (같은 seed 면 같은 결과)')
+    return parser.parse_args(argv)
+
+
+def run_monte_carlo(args):
+    if args.diameter is None:
+        print('입력 오류: --monte-carlo 에는 --diameter 가 필요합니다.')
+        return
+    names = MATERIAL_NAMES if args.material is None else (args.material,)
+    print(f'---------------Monte Carlo 공차 분석 (지름 {args.diameter}±{args.diameter_sd}m, '
+          f'두께 {args.thickness}±{args.thickness_sd}cm, 표본 {args.samples:,}개)---------------')
+    for name in names:
+        try:
+            result = monte_carlo_mass(MATERIAL_CODES[name], args.diameter, args.thickness,
+                                      args.diameter_sd, args.thickness_sd, args.samples,
+                                      args.budget, workers=args.workers, seed=args.seed)
+        except ValueError as e:
+            print(f'입력 오류: {e}')
+            return
+        percentiles = ', '.join(f'p{p} {value:.3f}' for p, value in result['percentiles'].items())
+        line = (f"재질 -> {name}, 평균 무게 -> {result['mean']:.3f} kg "
+                f"(표준편차 {result['std']:.3f}), {percentiles}")
+        if result['exceed_probability'] is not None:
+            line += f", {args.budget} kg 초과 확률 -> {result['exceed_probability']:.4%}"
+        if result['invalid']:
+            line += f", 제외된 표본 {result['invalid']:,}개"
+        print(line)
+
+
+def run_optimizer(args):
+    if args.budget <= 0:
+        print('입력 오류: 무게 예산은 0보다 커야 합니다.')
+        return
+    codes = np.arange(len(MATERIAL_NAMES))
+    diameters = solve_diameter(args.budget, codes, args.thickness)
+    thicknesses = None if args.diameter is None else solve_thickness(args.budget, codes, args.diameter)
+    print(f'---------------화성 무게 {args.budget} kg 이하 설계---------------')
+    for code, name in enumerate(MATERIAL_NAMES):
+        line = f'재질 -> {name}, 두께 {args.thickness}cm 최대 지름 -> {diameters[code]:.3f}m'
+        if thicknesses is not None:
+            line += f', 지름 {args.diameter}m 두께 -> {thicknesses[code]:.3f}cm'
+        print(line)
+
+    if args.pareto:
+        d_min, d_max, d_count = args.grid_diameter
+        t_min, t_max, t_count = args.grid_thickness
+        frontier = pareto_frontier(args.budget, np.linspace(d_min, d_max, int(d_count)),
+                                   np.linspace(t_min, t_max, int(t_count)))
+        print(f'---------------Pareto frontier ({len(frontier)}개)---------------')
+        for design in frontier:
+            print(f'재질 -> {design.material}, 지름 -> {design.diameter:.3f}, '
+                  f'두께 -> {design.thickness:.3f}, 면적 -> {design.area:.3f}, '
+                  f'무게 -> {design.mass:.3f} kg')
+
+
+def run_batch(args):
+    output = args.output
+    if output is None:
+        root, ext = os.path.splitext(args.batch)
+        output = f'{root}_result{ext or ".csv"}'
+    try:
+        count, invalid = run_batch_csv(args.batch, output, args.chunk_size)
+    except FileNotFoundError:
+        print('[ERROR] 파일이 없습니다')
+        return
+    except (UnicodeDecodeError, ValueError) as e:
+        print(f'[ERROR] {e}')
+        return
+    print(f'[INFO] 설계 {count}건 계산 (입력 오류 {invalid}건): {output}')
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.batch is not None:
+        run_batch(args)
+        return
+
+    if args.monte_carlo:
+        run_monte_carlo(args)
+        return
+
+    if args.budget is not None:
+        run_optimizer(args)
+        return
+
     while True:
         try:
             cmd = input(